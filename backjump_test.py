@@ -0,0 +1,44 @@
+import backjump
+import benchmark
+import bitboard
+import solution_test
+import unittest
+
+
+class TestBackjump(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    solved_diag_sudoku = solution_test.TestDiagonalSudoku.solved_diag_sudoku
+
+    def test_solve(self):
+        self.assertEqual(backjump.solve(self.diagonal_grid), self.solved_diag_sudoku)
+
+    def test_matches_bitboard(self):
+        for grid in benchmark.load_corpus('hard') + benchmark.load_corpus('pathological'):
+            self.assertEqual(backjump.solve(grid), bitboard.solve(grid))
+
+    def test_conflict_set(self):
+        # Box A1 can only be 1 and 2 once B1 and C1 are guessed 1 and 2
+        board = bitboard.Board.from_grid('.' * 81)
+        state = backjump.BackjumpSearch(board)
+        b1, c1 = board.cells[9], board.cells[18]
+        self.assertIsNone(state.remove(9, b1 & ~1, 1 << 1))
+        self.assertIsNone(state.remove(18, c1 & ~2, 1 << 2))
+        self.assertIsNone(state.remove(0, bitboard.ALL_DIGITS & ~3, 1 << 3))
+        self.assertEqual(state.propagate(), (1 << 1) | (1 << 2) | (1 << 3))
+
+    def test_nogood(self):
+        # Guessing 1 for B1 and 2 for C1 was refuted, so once C1 is 2 again,
+        # 1 for B1 is ruled out because of C1's level alone
+        state = backjump.BackjumpSearch(bitboard.Board.from_grid('.' * 81))
+        state.guesses.update({1: (9, 1), 2: (18, 2)})
+        state.learn((1 << 1) | (1 << 2))
+        state.guesses.clear()
+
+        self.assertIsNone(state.nogood_why(9, 1))
+        state.guessed[18] = (1 << 5, 2)
+        self.assertEqual(state.nogood_why(9, 1), 1 << 5)
+        self.assertEqual(state.nogoods_used, 1)
+        self.assertIsNone(state.nogood_why(9, 4))
+
+if __name__ == '__main__':
+    unittest.main()
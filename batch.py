@@ -0,0 +1,139 @@
+"""
+Solve many Sudoku puzzles at once, spread over a pool of worker processes.
+
+Puzzles go in and solutions come out as 81-char grid strings, which are far
+cheaper to pickle between processes than the dict form.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from importlib import import_module
+from itertools import islice
+
+import solution
+from utils import convert_dict_to_grid_string
+
+# How many chunks each worker may have queued up, so that large inputs are
+# consumed as the pool gets through them rather than all at once.
+CHUNKS_PER_WORKER = 4
+
+# Engines, by name -> module, which solve a whole chunk of grids at once with
+# their own `solve_batch(grids)`, rather than one grid at a time.
+BATCH_ENGINES = {
+    'numpy': 'vectorized',
+}
+
+def solve_grid(grid, engine=None):
+    """
+    Solve a single grid with `solution.solve`.
+
+    Args:
+        grid(string): a string representing a sudoku grid
+        engine(string): the name of the engine to solve with, see `solution.ENGINES`
+
+    Returns:
+        The solved grid as an 81-char string. False if no solution exists.
+    """
+    # Record this puzzle's history in a history of its own, so it doesn't pile
+    # up in long-lived workers, and the caller's history is left alone when
+    # solving in process
+    history = solution.assignments
+    solution.assignments = type(history)()
+    try:
+        solved = solution.solve(grid, engine=engine)
+    finally:
+        solution.assignments = history
+
+    if solved:
+        return convert_dict_to_grid_string(solved)
+    else:
+        return False
+
+def solve_chunk(grids, engine=None):
+    """
+    Solve a chunk of grids, all at once if `engine` is one of `BATCH_ENGINES`.
+    Grids which are None, e.g. for input which isn't a puzzle, give None.
+    """
+    puzzles = [grid for grid in grids if grid is not None]
+
+    if engine in BATCH_ENGINES and all(len(grid) == 81 for grid in puzzles):
+        results = iter(import_module(BATCH_ENGINES[engine]).solve_batch(puzzles))
+    else:
+        results = (solve_grid(grid, engine) for grid in puzzles)
+
+    return [None if grid is None else next(results) for grid in grids]
+
+def chunks(grids, chunksize):
+    """
+    Lazily split an iterable of grids into lists of at most `chunksize` grids.
+    """
+    grids = iter(grids)
+    while True:
+        chunk = list(islice(grids, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+def solve_many(grids, workers=None, chunksize=64, ordered=True, engine=None):
+    """
+    Solve many Sudoku grids over a pool of worker processes.
+
+    Grids are read from `grids` lazily, and only a few chunks per worker are in
+    flight at any time, so `grids` may be a generator over a very large input.
+
+    Args:
+        grids(iterable): strings, each representing a sudoku grid, or None to
+            keep a place for input which isn't a puzzle
+        workers(int): The number of worker processes, by default one per CPU.
+            With 1 worker every grid is solved in this process.
+        chunksize(int): How many grids to send to a worker at a time
+        ordered(bool): Whether to yield solutions in input order. Otherwise they
+            are yielded as they complete, as (input position, solution) pairs.
+        engine(string): the name of the engine to solve with, see `solution.ENGINES`
+            and `BATCH_ENGINES`
+
+    Yields:
+        The solved grids as strings, False for grids with no solution, or None
+        for None grids. If `ordered` is False, (input position, solution) pairs.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1:
+        position = 0
+        for chunk in chunks(grids, chunksize):
+            for result in solve_chunk(chunk, engine):
+                yield result if ordered else (position, result)
+                position += 1
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Chunks in flight, as (position of the first grid, future) pairs
+        pending = deque()
+        position = 0
+
+        for chunk in chunks(grids, chunksize):
+            pending.append((position, executor.submit(solve_chunk, chunk, engine)))
+            position += len(chunk)
+
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                yield from collect_results(pending, ordered)
+
+        while pending:
+            yield from collect_results(pending, ordered)
+
+def collect_results(pending, ordered):
+    """
+    Wait for, and yield the results of, the next chunk to finish: the oldest one
+    if `ordered`, or whichever one completes first otherwise.
+    """
+    if ordered:
+        start, future = pending.popleft()
+        yield from future.result()
+        return
+
+    done, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+    for start, future in [entry for entry in pending if entry[1] in done]:
+        pending.remove((start, future))
+        for offset, result in enumerate(future.result()):
+            yield start + offset, result
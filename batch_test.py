@@ -0,0 +1,49 @@
+import batch
+import importlib.util
+import solution
+import solution_test
+import unittest
+from utils import convert_dict_to_grid_string
+
+
+class TestSolveMany(unittest.TestCase):
+    grids = [
+        solution_test.TestDiagonalSudoku.diagonal_grid,
+        '9.1....8.8.5.7..4.2.4....6...7......5..............83.3..6......9................',
+        # Two 1s in the first row
+        '11...............................................................................',
+    ]
+    solved_diag_grid = convert_dict_to_grid_string(solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+
+    def check(self, results):
+        self.assertEqual(results[0], self.solved_diag_grid)
+        self.assertEqual(len(results[1]), 81)
+        self.assertNotIn('.', results[1])
+        self.assertEqual(results[2], False)
+
+    def test_in_process(self):
+        self.check(list(batch.solve_many(self.grids, workers=1, engine='bitmask')))
+
+    def test_ordered(self):
+        self.check(list(batch.solve_many(self.grids, workers=2, chunksize=1, engine='bitmask')))
+
+    @unittest.skipUnless(importlib.util.find_spec('numpy'), 'requires numpy')
+    def test_numpy(self):
+        self.check(list(batch.solve_many(self.grids, workers=1, engine='numpy')))
+
+    def test_unordered(self):
+        results = dict(batch.solve_many(self.grids, workers=2, chunksize=1, ordered=False, engine='bitmask'))
+        self.check([results[i] for i in range(len(self.grids))])
+
+    def test_keeps_history(self):
+        history = solution.assignments
+        history.append({'A1': '1'})
+        try:
+            self.assertEqual(batch.solve_grid(self.grids[0]), self.solved_diag_grid)
+            self.assertIs(solution.assignments, history)
+            self.assertEqual(list(history), [{'A1': '1'}])
+        finally:
+            history.clear()
+
+if __name__ == '__main__':
+    unittest.main()
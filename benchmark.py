@@ -0,0 +1,326 @@
+"""
+A benchmark harness for the Sudoku solvers in this repo.
+
+Each solver is run over the puzzle corpora in `benchmarks/` (easy, hard and
+pathological diagonal sudokus, one per line, and 16x16 and 25x25 ones for the
+solvers of any size), reporting for every corpus:
+
+    * puzzles per second
+    * p50 and p99 latency per puzzle
+    * search nodes, counted by wrapping the solver's recursive `search`, or
+      read off its iterative `Solver`
+    * peak memory per puzzle, as traced by tracemalloc (in a separate pass, as
+      tracing slows solving down a lot)
+    * unsolved puzzles, for which the solver found no solution, and invalid
+      ones, for which it returned something other than a solution. Every result
+      is checked against the givens and every unit, outside the timings.
+
+Results can be saved as JSON, and compared against a stored baseline to catch
+regressions.
+
+Example:
+    python benchmark.py --solvers bitmask solution --save results.json
+    python benchmark.py --baseline benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from importlib import import_module
+
+from board import geometry_of
+
+BENCHMARKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+
+CORPORA = ['easy', 'hard', 'pathological', '16x16', '25x25']
+
+# The corpora of boards other than 9x9, which only `LARGE_SOLVERS` are run over
+LARGE_CORPORA = ['16x16', '25x25']
+
+"""
+The solvers to benchmark, by name -> (module, engine, search module, options).
+Puzzles are solved with `module.solve(grid)`, or `module.solve(grid, engine=engine,
+**options)` if an engine is given, and search nodes are counted on `search module`.
+"""
+SOLVERS = {
+    'solution': ('solution', None, 'solution', {}),
+    'solution_2': ('solution_2', None, 'solution_2', {}),
+    'sol': ('sol', None, 'sol', {}),
+    'bitmask': ('solution', 'bitmask', 'bitboard', {}),
+    'bitmask-degree': ('solution', 'bitmask', 'bitboard', {'variable': 'mrv-degree'}),
+    'bitmask-wdeg': ('solution', 'bitmask', 'bitboard', {'variable': 'dom-wdeg'}),
+    'bitmask-lcv': ('solution', 'bitmask', 'bitboard', {'value': 'lcv'}),
+    'bitmask-random': ('solution', 'bitmask', 'bitboard', {'variable': 'random', 'seed': 0}),
+    'dlx': ('solution', 'dlx', 'dlx', {}),
+    'backjump': ('backjump', None, 'backjump', {}),
+    'wide': ('solution', 'wide', 'wideboard', {}),
+}
+
+# The solvers which solve boards of any size
+LARGE_SOLVERS = ['wide']
+
+def load_corpus(name):
+    """
+    Read a corpus of puzzles from `benchmarks/<name>.txt`, skipping '#' comments.
+
+    Returns:
+        A list of grid strings.
+    """
+    with open(os.path.join(BENCHMARKS_DIR, name + '.txt')) as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+def get_solver(name):
+    """
+    Returns:
+        The solve function of the solver `name`, and the module on which to count
+        its search nodes.
+    """
+    module_name, engine, search_module_name, options = SOLVERS[name]
+    module = import_module(module_name)
+
+    if engine is None:
+        solve = module.solve
+    else:
+        solve = lambda grid: module.solve(grid, engine=engine, **options)
+
+    return solve, import_module(search_module_name)
+
+@contextlib.contextmanager
+def count_nodes(module):
+    """
+    Count the search nodes expanded within the block. For a module with an
+    iterative `Solver`, these are the nodes it reports. Otherwise they are the
+    calls made to `module.search`: the recursive calls look `search` up in the
+    module's globals, so every node is counted.
+
+    Yields:
+        A single-item list holding the count.
+    """
+    count = [0]
+    solver = getattr(module, 'Solver', None)
+
+    if solver is not None:
+        run = solver.run
+
+        def counted_run(self, *args, **kwargs):
+            nodes = self.nodes
+            try:
+                return run(self, *args, **kwargs)
+            finally:
+                count[0] += self.nodes - nodes
+
+        solver.run = counted_run
+        try:
+            yield count
+        finally:
+            solver.run = run
+        return
+
+    search = module.search
+
+    def counted_search(*args, **kwargs):
+        count[0] += 1
+        return search(*args, **kwargs)
+
+    module.search = counted_search
+    try:
+        yield count
+    finally:
+        module.search = search
+
+def is_solution(grid, values):
+    """
+    Whether `values`, as returned by a solver, solves `grid`: every box holds a
+    single digit, the givens are kept, and every unit, diagonals included, holds
+    every digit once.
+    """
+    geometry = geometry_of(grid)
+    try:
+        digits = [values[box] for box in geometry.BOXES]
+    except (KeyError, TypeError):
+        return False
+
+    if any(x != '.' and x != digit for x, digit in zip(grid, digits)):
+        return False
+
+    solved = dict(zip(geometry.BOXES, digits))
+    expected = sorted(geometry.DIGITS)
+    return all(sorted(solved[box] for box in unit) == expected for unit in geometry.ALL_UNITS)
+
+def percentile(values, q):
+    """
+    The nearest-rank percentile `q` (0-100) of a sorted list of values.
+    """
+    return values[min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))]
+
+def clear_history(*modules):
+    """
+    Forget the assignments recorded by the solvers, so they don't pile up.
+    """
+    for module in modules:
+        assignments = getattr(module, 'assignments', None)
+        if assignments is not None:
+            assignments.clear()
+
+def run_corpus(solver, grids, memory=True):
+    """
+    Benchmark a single solver over a list of grids.
+
+    Args:
+        solver(string): The name of a solver in `SOLVERS`
+        grids(list): The grid strings to solve
+        memory(bool): Whether to also measure the peak memory per puzzle
+
+    Returns:
+        A dict of the results.
+    """
+    solve, search_module = get_solver(solver)
+    solve_module = import_module(SOLVERS[solver][0])
+
+    latencies = []
+    failures = 0
+    invalid = 0
+
+    # Some solvers print as they go, which would swamp the report
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        with count_nodes(search_module) as nodes:
+            for grid in grids:
+                start = time.perf_counter()
+                values = solve(grid)
+                latencies.append(time.perf_counter() - start)
+
+                if not values:
+                    failures += 1
+                elif not is_solution(grid, values):
+                    invalid += 1
+                clear_history(solve_module, search_module)
+
+        peak = None
+        if memory:
+            tracemalloc.start()
+            peak = 0
+            for grid in grids:
+                tracemalloc.reset_peak()
+                solve(grid)
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                clear_history(solve_module, search_module)
+            tracemalloc.stop()
+
+    total = sum(latencies)
+    latencies.sort()
+
+    return {
+        'puzzles': len(grids),
+        'unsolved': failures,
+        'invalid': invalid,
+        'seconds': total,
+        'puzzles_per_second': len(grids) / total if total else None,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'nodes': nodes[0],
+        'peak_memory_kb': peak / 1024.0 if peak is not None else None,
+    }
+
+def run(solvers, corpora, limit=None, memory=True):
+    """
+    Benchmark every solver over every corpus.
+
+    Returns:
+        The results, of the form {'solvers': {solver: {corpus: {...}}}, ...}
+    """
+    results = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'solvers': {},
+    }
+
+    for corpus in corpora:
+        grids = load_corpus(corpus)[:limit]
+        for solver in solvers:
+            if corpus in LARGE_CORPORA and solver not in LARGE_SOLVERS:
+                continue
+            result = run_corpus(solver, grids, memory)
+            results['solvers'].setdefault(solver, {})[corpus] = result
+            print_result(solver, corpus, result)
+
+    return results
+
+def print_result(solver, corpus, result):
+    print('%-15s %-13s %9.1f puzzles/s  p50 %8.2fms  p99 %8.2fms  %7d nodes%s%s' % (
+        solver, corpus, result['puzzles_per_second'] or 0.0, result['p50_ms'], result['p99_ms'],
+        result['nodes'],
+        '  %8.1fKB peak' % result['peak_memory_kb'] if result['peak_memory_kb'] is not None else '',
+        '  %d INVALID' % result['invalid'] if result['invalid'] else '',
+    ))
+
+def compare(results, baseline, tolerance=0.1):
+    """
+    Compare results against a baseline, printing the change for every solver and
+    corpus found in both.
+
+    Args:
+        results(dict): The results of `run`
+        baseline(dict): Results of an earlier `run`
+        tolerance(float): The slow down, as a fraction, beyond which a result
+            counts as a regression. Any more invalid results than the baseline's
+            are a regression too.
+
+    Returns:
+        A list of (solver, corpus) pairs which regressed.
+    """
+    regressions = []
+
+    for solver, corpora in sorted(results['solvers'].items()):
+        for corpus, result in sorted(corpora.items()):
+            before = baseline['solvers'].get(solver, {}).get(corpus)
+            if not before or not before['puzzles_per_second'] or before['puzzles'] != result['puzzles']:
+                continue
+
+            speedup = result['puzzles_per_second'] / before['puzzles_per_second']
+            regressed = speedup < 1 - tolerance or result['invalid'] > before.get('invalid', 0)
+            if regressed:
+                regressions.append((solver, corpus))
+
+            print('%-15s %-13s %6.2fx speed  %7d -> %7d nodes%s' % (
+                solver, corpus, speedup, before['nodes'], result['nodes'],
+                '  REGRESSION' if regressed else '',
+            ))
+
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Sudoku solvers.')
+    parser.add_argument('--solvers', nargs='+', default=sorted(SOLVERS), choices=sorted(SOLVERS),
+                        help='solvers to benchmark (default all)')
+    parser.add_argument('--corpora', nargs='+', default=CORPORA, choices=CORPORA,
+                        help='corpora to run (default all)')
+    parser.add_argument('--limit', type=int, default=None,
+                        help='run at most this many puzzles of each corpus')
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='skip the tracemalloc pass')
+    parser.add_argument('--save', help='file to save the results to, as JSON')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='slow down beyond which a result is a regression (default 0.1)')
+    args = parser.parse_args(argv)
+
+    results = run(args.solvers, args.corpora, args.limit, args.memory)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print()
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
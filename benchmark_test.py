@@ -0,0 +1,46 @@
+import benchmark
+import bitboard
+import unittest
+from unittest import mock
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_percentile(self):
+        values = list(range(101))
+        self.assertEqual(benchmark.percentile(values, 50), 50)
+        self.assertEqual(benchmark.percentile(values, 99), 99)
+
+    def test_run_corpus(self):
+        grids = benchmark.load_corpus('hard')[:3]
+        result = benchmark.run_corpus('bitmask', grids)
+        self.assertEqual(result['puzzles'], 3)
+        self.assertEqual(result['unsolved'], 0)
+        self.assertEqual(result['invalid'], 0)
+        self.assertGreater(result['nodes'], 0)
+        self.assertGreater(result['peak_memory_kb'], 0)
+
+    def test_invalid(self):
+        grid = benchmark.load_corpus('hard')[0]
+        solved = bitboard.solve(grid)
+        self.assertTrue(benchmark.is_solution(grid, solved))
+
+        # Two boxes of the first row swapped keep every row, but not the columns
+        swapped = dict(solved, A1=solved['A2'], A2=solved['A1'])
+        self.assertFalse(benchmark.is_solution('.' * 81, swapped))
+        # A given changed
+        self.assertFalse(benchmark.is_solution('.' * 80 + ('1' if solved['I9'] != '1' else '2'), solved))
+
+        with mock.patch.dict(benchmark.SOLVERS, {'broken': ('bitboard', None, 'bitboard', {})}), \
+                mock.patch('bitboard.solve', lambda grid: swapped):
+            result = benchmark.run_corpus('broken', [grid], memory=False)
+        self.assertEqual((result['unsolved'], result['invalid']), (0, 1))
+
+    def test_compare(self):
+        results = benchmark.run(['bitmask'], ['easy'], limit=5, memory=False)
+        slower = {'solvers': {'bitmask': {'easy': dict(results['solvers']['bitmask']['easy'])}}}
+        slower['solvers']['bitmask']['easy']['puzzles_per_second'] *= 10
+        self.assertEqual(benchmark.compare(results, slower), [('bitmask', 'easy')])
+        self.assertEqual(benchmark.compare(results, results), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,687 @@
+"""
+A bitmask board engine for solving Diagonal Sudoku puzzles.
+
+Instead of keeping each box's candidates as a digit string like '1379', every
+box holds a 9-bit integer where bit `d - 1` is set if digit `d` is still possible.
+The strategies then work with `&`, `|` and table lookups rather than with
+`str.replace`, `in` and `len`.
+
+The masks are held by a `Board`, in a flat 81-slot list indexed like `BOXES`, and
+the strategies walk the integer peer and unit tables from `board.py` rather than
+hashing 'A1'-style keys. Boards are converted to and from the usual dict-of-strings
+form at the edges, so `display` and the tests in `solution_test.py` keep working
+unchanged.
+
+The search never copies a board. A single board is mutated in place, with every
+change recorded on its trail, and backtracking undoes the trail back to the mark
+taken before the guess. The guesses are kept on an explicit stack of choice points
+by a `Solver`, so a search can be suspended, inspected and resumed.
+
+Propagation is event driven. Every box whose candidates change is queued, and
+only the strategies watching that box, or one of its units, run again. A board
+fails as soon as any box runs out of candidates.
+"""
+from board import BOXES, UNIT_INDICES, PEER_INDICES
+
+
+# ==== BITMASK TABLES ======================================================================
+
+DIGITS = '123456789'
+
+# The mask with every digit still possible, i.e. an empty box
+ALL_DIGITS = (1 << len(DIGITS)) - 1
+
+# Maps from a digit to its bit e.g. '3' -> 0b000000100
+BIT_OF = dict((digit, 1 << i) for i, digit in enumerate(DIGITS))
+
+# The tables below are indexed by mask, for every possible mask.
+
+# The number of candidates in a mask
+POPCOUNT = tuple(bin(mask).count('1') for mask in range(ALL_DIGITS + 1))
+
+# The lowest set bit of a mask e.g. 0b0110 -> 0b0010
+LOWEST_BIT = tuple(mask & -mask for mask in range(ALL_DIGITS + 1))
+
+# The single-bit masks making up a mask, in ascending digit order
+BITS_OF = tuple(
+    tuple(BIT_OF[digit] for digit in DIGITS if mask & BIT_OF[digit])
+    for mask in range(ALL_DIGITS + 1)
+)
+
+# The bits of each mask, highest first, so they can be popped off in digit order
+REVERSED_BITS_OF = tuple(bits[::-1] for bits in BITS_OF)
+
+# The digit indices (0-8) of each mask, in ascending order e.g. 0b0101 -> (0, 2)
+INDICES_OF = tuple(
+    tuple(d for d in range(len(DIGITS)) if mask >> d & 1)
+    for mask in range(ALL_DIGITS + 1)
+)
+
+# The digit string of a mask e.g. 0b0101 -> '13'
+DIGITS_OF = tuple(
+    ''.join(digit for digit in DIGITS if mask & BIT_OF[digit])
+    for mask in range(ALL_DIGITS + 1)
+)
+
+
+# ==== BOARD ======================================================================
+
+# Maps from a digit string in digit order -> its mask e.g. '13' -> 0b0101
+MASK_OF_DIGITS = dict((digits, mask) for mask, digits in enumerate(DIGITS_OF))
+
+def mask_of(digits):
+    """
+    Convert a string of candidate digits into a mask.
+
+    Args:
+        digits(string): The candidates of a box, e.g. '137'
+
+    Returns:
+        The mask of those candidates, e.g. 0b001000101
+    """
+    mask = MASK_OF_DIGITS.get(digits)
+    if mask is None:
+        mask = 0
+        for digit in digits:
+            mask |= BIT_OF[digit]
+    return mask
+
+class Board:
+    """
+    A board state, holding one candidate mask per box in `cells`.
+
+    `cells[i]` holds the candidates of the box `BOXES[i]`. Changes made through
+    `set` are recorded on the `trail` as flat (index, old mask) pairs, so they can
+    be undone back to a `mark`, and queued on `pending` for `propagate`.
+    """
+    __slots__ = ('cells', 'trail', 'pending')
+
+    def __init__(self, cells):
+        self.cells = cells
+        self.trail = []
+        self.pending = []
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        Create a board from a grid string, with every digit possible for empties.
+
+        Args:
+            grid(string) - A grid in string form.
+        """
+        assert len(grid) == 81, "Input grid must be a string of length 81 (9x9)"
+
+        return cls([BIT_OF[x] if x != '.' else ALL_DIGITS for x in grid])
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        Create a board from the dict-of-strings form.
+
+        Args:
+            values(dict): a dictionary of the form {'box_name': '123456789', ...}
+        """
+        return cls([mask_of(values[box]) for box in BOXES])
+
+    def to_values(self):
+        """
+        Convert the board back into dict-of-strings form.
+
+        Returns:
+            A dictionary of the form {'box_name': '123456789', ...}
+        """
+        return dict(zip(BOXES, [DIGITS_OF[mask] for mask in self.cells]))
+
+    def set(self, i, mask):
+        """
+        Set the candidates of box `i`, recording the old ones on the trail and
+        queueing the box for propagation.
+
+        Args:
+            i(int): The index of the box to update
+            mask(int): The new candidates of the box
+        """
+        old = self.cells[i]
+        if old != mask:
+            self.cells[i] = mask
+            self.trail += (i, old)
+            self.pending.append(i)
+
+    def mark(self):
+        """
+        Returns:
+            A mark of the current trail position, to later `undo` back to.
+        """
+        return len(self.trail)
+
+    def undo(self, mark):
+        """
+        Restore every box changed since `mark` was taken.
+
+        Args:
+            mark(int): A trail position returned by `mark`
+        """
+        cells = self.cells
+        trail = self.trail
+        del self.pending[:]
+        while len(trail) > mark:
+            old = trail.pop()
+            cells[trail.pop()] = old
+
+
+# ==== STRATEGIES ======================================================================
+
+# Strategies are propagators. Each one is triggered either by a change to a box
+# (it takes the box index) or by a change to any box of a unit (it takes the
+# unit, as a tuple of box indices). They make their changes through `Board.set`,
+# which queues the changed boxes in turn, and return False as soon as they find
+# the board inconsistent.
+
+# For each box index, the positions in `UNIT_INDICES` of the units it belongs to
+UNIT_IDS_OF = tuple(
+    tuple(k for k, unit in enumerate(UNIT_INDICES) if i in unit)
+    for i in range(81)
+)
+
+def elimination(board, i):
+    """
+    Eliminate values using the Elimination strategy, triggered by a change to box `i`.
+
+    Args:
+        board(Board): The game state
+        i(int): The index of the changed box
+
+    Returns:
+        False if removing the digit of a solved box empties a peer, True otherwise.
+    """
+    cells = board.cells
+    mask = cells[i]
+
+    if POPCOUNT[mask] == 1:
+        for peer in PEER_INDICES[i]:
+            if cells[peer] & mask:
+                if cells[peer] == mask:
+                    return False
+                board.set(peer, cells[peer] & ~mask)
+
+    return True
+
+def only_choice(board, unit):
+    """
+    Eliminate values using the Only Choice strategy, triggered by a change to `unit`.
+
+    Args:
+        board(Board): The game state
+        unit(tuple): The indices of the boxes in the changed unit
+
+    Returns:
+        False if a digit has no place left in the unit, or two digits need the
+        same box. True otherwise.
+    """
+    cells = board.cells
+
+    # Digits seen in at least one box, and in at least two boxes of the unit
+    once = twice = 0
+    for i in unit:
+        mask = cells[i]
+        twice |= once & mask
+        once |= mask
+
+    if once != ALL_DIGITS:
+        return False
+
+    only = once & ~twice
+    if only:
+        for i in unit:
+            mask = cells[i] & only
+            if mask and mask != cells[i]:
+                if POPCOUNT[mask] > 1:
+                    return False
+                board.set(i, mask)
+
+    return True
+
+def naked_twins(board, unit):
+    """
+    Eliminate values using the Naked Twins strategy, triggered by a change to `unit`.
+
+    Args:
+        board(Board): The game state
+        unit(tuple): The indices of the boxes in the changed unit
+
+    Returns:
+        False if the twins leave a box empty, or three boxes share the same two
+        values. True otherwise.
+    """
+    cells = board.cells
+
+    # Bivalue masks seen so far in this unit, to spot a repeated one
+    seen = set()
+    twins = set()
+    for i in unit:
+        mask = cells[i]
+        if POPCOUNT[mask] == 2:
+            if mask in twins:
+                return False
+            if mask in seen:
+                twins.add(mask)
+            seen.add(mask)
+
+    for twin in twins:
+        for i in unit:
+            mask = cells[i]
+            if mask != twin and mask & twin:
+                if not mask & ~twin:
+                    return False
+                board.set(i, mask & ~twin)
+
+    return True
+
+# The largest naked subsets to look for. Quads are the largest worth finding, as a
+# unit of 9 with a naked subset of 5 has a hidden subset of at most 4.
+MAX_SUBSET_SIZE = 4
+
+def find_naked_subsets(masks, max_size=MAX_SUBSET_SIZE):
+    """
+    Find the naked subsets among the candidate masks of a unit: n unfilled boxes
+    holding only n candidates between them, for n from 2 to `max_size`. Those
+    candidates must go in those boxes, so can be ruled out of the rest of the unit.
+
+    Args:
+        masks(list): The candidate masks of the boxes of a unit
+        max_size(int): The most boxes in a subset
+
+    Returns:
+        A list of (candidates mask, positions in `masks`) pairs, one per subset.
+    """
+    # The unfilled boxes with few enough candidates to be in a subset
+    small = []
+    unfilled = 0
+    for p, mask in enumerate(masks):
+        n = POPCOUNT[mask]
+        if n > 1:
+            unfilled += 1
+            if n <= max_size:
+                small.append((mask, p))
+
+    if len(small) < 2:
+        return []
+
+    # A subset of every unfilled box rules nothing out
+    limit = min(max_size, unfilled - 1)
+    found = []
+
+    # Grow subsets of boxes in position order, dropping any whose candidates
+    # outnumber the limit, or the boxes left to add
+    stack = [(0, 0, ())]
+    while stack:
+        start, union, members = stack.pop()
+        for k in range(start, len(small)):
+            mask, p = small[k]
+            subset = union | mask
+            n = POPCOUNT[subset]
+            if n > limit or n - len(members) > len(small) - k:
+                continue
+            if len(members) + 1 == n:
+                found.append((subset, members + (p,)))
+            else:
+                stack.append((k + 1, subset, members + (p,)))
+
+    return found
+
+def places_of(masks):
+    """
+    Swap boxes and digits: for each digit, the mask of the positions among
+    `masks` it can still go in.
+
+    Args:
+        masks(list): The candidate masks of at most 9 boxes, e.g. a unit
+
+    Returns:
+        A list of 9 position masks, one per digit index.
+    """
+    places = [0] * len(DIGITS)
+    for p, mask in enumerate(masks):
+        bit = 1 << p
+        for d in INDICES_OF[mask]:
+            places[d] |= bit
+    return places
+
+"""
+The constraint propagation strategies used while searching for a solution, by
+what triggers them. Box strategies run first, to a fixpoint, before any of the
+more expensive unit strategies.
+"""
+BOX_STRATEGIES = [
+    elimination,
+]
+
+UNIT_STRATEGIES = [
+    only_choice,
+    naked_twins,
+]
+
+KNOWN_STRATEGIES = BOX_STRATEGIES + UNIT_STRATEGIES
+
+
+# ==== CORE PROGRAM ======================================================================
+
+def propagate(board, box_strategies=BOX_STRATEGIES, unit_strategies=UNIT_STRATEGIES):
+    """
+    Run the strategies triggered by every box queued on `board.pending`, and by
+    the boxes they change in turn, until nothing is left to do.
+
+    Args:
+        board(Board): The game state
+        box_strategies(list): The strategies triggered by a box, by default all of them
+        unit_strategies(list): The strategies triggered by a unit, by default all of them
+
+    Returns:
+        True once the queue is empty, or False as soon as the board is found to
+        be inconsistent.
+    """
+    pending = board.pending
+
+    # Units waiting for their strategies, and whether each one is queued already
+    units = []
+    queued = [False] * len(UNIT_INDICES)
+
+    while True:
+        while pending:
+            i = pending.pop()
+
+            for strategy in box_strategies:
+                if not strategy(board, i):
+                    del pending[:]
+                    return False
+
+            for k in UNIT_IDS_OF[i]:
+                if not queued[k]:
+                    queued[k] = True
+                    units.append(k)
+
+        if not units:
+            return True
+
+        k = units.pop()
+        queued[k] = False
+
+        for strategy in unit_strategies:
+            if not strategy(board, UNIT_INDICES[k]):
+                del pending[:]
+                return False
+
+            # Get back to the cheap box strategies as soon as anything changed.
+            # Any change is within this unit, so it gets queued again.
+            if pending:
+                break
+
+def reduce_puzzle(board):
+    """
+    Propagate every constraint on the board until there is no improvement of
+    the board state.
+
+    Args:
+        board(Board): The game state
+
+    Returns:
+        The new game state, or False if a box has no possible values left.
+    """
+    board.pending[:] = range(81)
+
+    if not propagate(board):
+        return False
+
+    return board
+
+def search(board):
+    """
+    Try to solve the Sudoku by repeatedly guessing values
+    and applying constraint propagation.
+
+    The board is solved in place. Each guess is undone through the trail if
+    it leads nowhere, so no copies are made, and only the strategies watching
+    the guessed box run again. The guesses are kept on the explicit stack of a
+    `Solver` rather than in recursive calls.
+
+    Args:
+        board(Board): The game state, already reduced
+
+    Returns:
+        The solved game state, or False if there is no solution.
+    """
+    if Solver(board).run():
+        return board
+    return False
+
+class Solver:
+    """
+    A depth-first search over a board like `search`, but driven by an explicit
+    stack of choice points rather than by recursion.
+
+    A solve can be run a few nodes at a time, and inspected in between through
+    `depth` and `nodes`. The stack holds one choice point per guess, so deep
+    searches don't run into the recursion limit.
+
+    Example:
+        solver = Solver(reduce_puzzle(Board.from_grid(grid)))
+        while solver.run(max_nodes=100) is None:
+            print(solver.depth, solver.nodes)
+    """
+    __slots__ = ('board', 'stack', 'nodes', 'backtracks', 'solved', 'variable', 'value')
+
+    def __init__(self, board, variable=None, value=None):
+        """
+        Args:
+            board(Board): The game state, already reduced. It is solved in place.
+            variable: Optional, the variable order choosing the box to guess,
+                see `heuristics.py`. By default the box with the fewest candidates.
+            value: Optional, the value order of the candidates to try, see
+                `heuristics.py`. By default digit order.
+        """
+        self.board = board
+        self.variable = variable
+        self.value = value
+
+        # The choice points, each a [box index, untried candidate bits, mark]
+        # list, with the next bit to try last. The mark is the trail position
+        # from before the box was guessed.
+        self.stack = []
+
+        # The nodes expanded, and the guesses which failed to propagate
+        self.nodes = 0
+        self.backtracks = 0
+
+        # None while the search is unfinished, then True or False
+        self.solved = None
+
+    @property
+    def depth(self):
+        """
+        The number of guesses the current board rests on.
+        """
+        return len(self.stack)
+
+    def choose(self):
+        """
+        Returns:
+            The index of the unfilled box to guess next, with the fewest
+            possibilities, or None if the board is solved.
+        """
+        if self.variable is not None:
+            return self.variable.select(self.board)
+
+        cells = self.board.cells
+        unsolved = [
+            (POPCOUNT[cells[i]], i)
+            for i in range(len(cells))
+            if POPCOUNT[cells[i]] > 1
+        ]
+
+        if not unsolved:
+            return None
+
+        return min(unsolved)[1]
+
+    def advance(self):
+        """
+        Move on to the next consistent guess, backtracking as far as needed.
+
+        Returns:
+            True once a guess propagates cleanly, or False if every choice point
+            is exhausted.
+        """
+        board = self.board
+        stack = self.stack
+
+        while stack:
+            choice = stack[-1]
+            s, untried, mark = choice
+            board.undo(mark)
+
+            if not untried:
+                stack.pop()
+                continue
+
+            board.set(s, untried.pop())
+            if propagate(board):
+                return True
+
+            self.backtracks += 1
+
+            if self.variable is not None:
+                self.variable.failed(board, s)
+
+        return False
+
+    def run(self, max_nodes=None):
+        """
+        Search until the board is solved, there is no solution, or `max_nodes`
+        more nodes have been expanded. A suspended search resumes where it left
+        off on the next call.
+
+        Args:
+            max_nodes(int): The most nodes to expand in this call, or None for no limit
+
+        Returns:
+            True if the board is solved, False if there is no solution, or None
+            if the search was suspended.
+        """
+        board = self.board
+        limit = None if max_nodes is None else self.nodes + max_nodes
+
+        while self.solved is None:
+            if self.nodes == limit:
+                return None
+            self.nodes += 1
+
+            s = self.choose()
+            if s is None:
+                self.solved = True
+            else:
+                if self.value is None:
+                    untried = list(REVERSED_BITS_OF[board.cells[s]])
+                else:
+                    untried = self.value.order(board, s)[::-1]
+                self.stack.append([s, untried, board.mark()])
+                if not self.advance():
+                    self.solved = False
+
+        return self.solved
+
+    def skip(self):
+        """
+        Move on from a solution to the next guess, so that the next `run` looks
+        for another solution.
+        """
+        self.solved = None if self.advance() else False
+
+def make_solver(grid, variable=None, value=None, seed=None):
+    """
+    Reduce a grid and set up a `Solver` for it.
+
+    Args:
+        grid(string): a string representing a sudoku grid.
+        variable(string): Optional, the name of the variable order to search with,
+            see `heuristics.VARIABLE_ORDERS`
+        value(string): Optional, the name of the value order to search with,
+            see `heuristics.VALUE_ORDERS`
+        seed: Optional, seed for the random heuristics
+
+    Returns:
+        The solver, or None if the grid reduces to a failed board.
+    """
+    board = reduce_puzzle(Board.from_grid(grid))
+    if not board:
+        return None
+
+    if variable is None and value is None:
+        return Solver(board)
+
+    from heuristics import get_heuristics
+    return Solver(board, *get_heuristics(variable, value, seed))
+
+def solve(grid, variable=None, value=None, seed=None):
+    """
+    Find the solution to a Sudoku grid.
+
+    Args:
+        grid(string): a string representing a sudoku grid.
+            Example: '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+        variable, value, seed: Optional search heuristics, see `make_solver`
+
+    Returns:
+        The dictionary representation of the final sudoku grid. False if no solution exists.
+    """
+    solver = make_solver(grid, variable, value, seed)
+
+    if solver is not None and solver.run():
+        return solver.board.to_values()
+    else:
+        return False
+
+def iter_solutions(grid, variable=None, value=None, seed=None):
+    """
+    Generate every solution of a Sudoku grid, one at a time. Only the current
+    search path is held in memory, and the search only goes on when the next
+    solution is asked for, so callers can stop after as many as they need.
+
+    Args:
+        grid(string): a string representing a sudoku grid.
+        variable, value, seed: Optional search heuristics, see `make_solver`
+
+    Yields:
+        The dictionary representation of each solution.
+    """
+    solver = make_solver(grid, variable, value, seed)
+    if solver is None:
+        return
+
+    while solver.run():
+        yield solver.board.to_values()
+        solver.skip()
+
+def count_solutions(grid, limit=2, variable=None, value=None, seed=None):
+    """
+    Count the solutions of a Sudoku grid, up to `limit`. The search stops as soon
+    as the limit is reached, so the default answers whether a puzzle has no
+    solution, exactly one, or more than one.
+
+    Args:
+        grid(string): a string representing a sudoku grid.
+        limit(int): The most solutions to count
+        variable, value, seed: Optional search heuristics, see `make_solver`
+
+    Returns:
+        The number of solutions found, at most `limit`.
+    """
+    solver = make_solver(grid, variable, value, seed)
+    if solver is None:
+        return 0
+
+    count = 0
+    while count < limit and solver.run():
+        count += 1
+        solver.skip()
+
+    return count
@@ -0,0 +1,121 @@
+import benchmark
+import bitboard
+import solution
+import solution_test
+import unittest
+
+
+class TestBoard(unittest.TestCase):
+    def test_round_trip(self):
+        values = solution_test.TestNakedTwins.before_naked_twins_1
+        self.assertEqual(bitboard.Board.from_values(values).to_values(), values)
+
+    def test_tables(self):
+        self.assertEqual(bitboard.POPCOUNT[bitboard.mask_of('137')], 3)
+        self.assertEqual(bitboard.LOWEST_BIT[bitboard.mask_of('37')], bitboard.BIT_OF['3'])
+        self.assertEqual(bitboard.DIGITS_OF[bitboard.ALL_DIGITS], '123456789')
+
+    def test_undo(self):
+        board = bitboard.Board.from_grid(solution_test.TestDiagonalSudoku.diagonal_grid)
+        before = board.cells[:]
+        mark = board.mark()
+        bitboard.reduce_puzzle(board)
+        self.assertNotEqual(board.cells, before)
+        board.undo(mark)
+        self.assertEqual(board.cells, before)
+
+
+class TestNakedTwins(unittest.TestCase):
+    def naked_twins(self, values):
+        board = bitboard.Board.from_values(values)
+        for unit in bitboard.UNIT_INDICES:
+            bitboard.naked_twins(board, unit)
+        return board.to_values()
+
+    def test_naked_twins(self):
+        self.assertTrue(self.naked_twins(solution_test.TestNakedTwins.before_naked_twins_1)
+                        in solution_test.TestNakedTwins.possible_solutions_1,
+                        "The bitmask naked_twins produced an unexpected board.")
+
+    def test_naked_twins2(self):
+        self.assertTrue(self.naked_twins(solution_test.TestNakedTwins.before_naked_twins_2)
+                        in solution_test.TestNakedTwins.possible_solutions_2,
+                        "The bitmask naked_twins produced an unexpected board.")
+
+
+class TestDiagonalSudoku(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    solved_diag_sudoku = solution_test.TestDiagonalSudoku.solved_diag_sudoku
+
+    def test_solve(self):
+        self.assertEqual(bitboard.solve(self.diagonal_grid), self.solved_diag_sudoku)
+
+    def test_solve_engine(self):
+        self.assertEqual(solution.solve(self.diagonal_grid, engine='bitmask'), self.solved_diag_sudoku)
+
+
+class TestSolver(unittest.TestCase):
+    # A minimal puzzle which needs a few hundred nodes
+    grid = benchmark.load_corpus('pathological')[0]
+
+    def test_suspend_and_resume(self):
+        board = bitboard.reduce_puzzle(bitboard.Board.from_grid(self.grid))
+        solver = bitboard.Solver(board)
+
+        self.assertIsNone(solver.run(max_nodes=5))
+        self.assertEqual(solver.nodes, 5)
+        self.assertGreater(solver.depth, 0)
+
+        while solver.run(max_nodes=5) is None:
+            pass
+        self.assertTrue(solver.solved)
+        self.assertEqual(board.to_values(), bitboard.solve(self.grid))
+
+    def test_unsolvable(self):
+        grid = benchmark.load_corpus('pathological')[-1]
+        board = bitboard.reduce_puzzle(bitboard.Board.from_grid(grid))
+        self.assertTrue(board is False or bitboard.Solver(board).run() is False)
+
+
+class TestCountSolutions(unittest.TestCase):
+    def loose_grid(self):
+        # Blanking the 1s and 2s of a solved grid leaves a few solutions, found
+        # by swapping 1s and 2s around
+        solved = bitboard.solve(solution_test.TestDiagonalSudoku.diagonal_grid)
+        return ''.join(solved[box] for box in bitboard.BOXES).replace('1', '.').replace('2', '.')
+
+    def test_unique(self):
+        for grid in benchmark.load_corpus('hard')[:5]:
+            self.assertEqual(bitboard.count_solutions(grid), 1)
+
+    def test_unsolvable(self):
+        self.assertEqual(bitboard.count_solutions(benchmark.load_corpus('pathological')[-1]), 0)
+
+    def test_limit(self):
+        self.assertEqual(bitboard.count_solutions('.' * 81), 2)
+        self.assertEqual(bitboard.count_solutions('.' * 81, limit=25), 25)
+
+    def test_exact_count(self):
+        grid = self.loose_grid()
+        count = bitboard.count_solutions(grid, limit=100)
+        self.assertGreater(count, 1)
+        self.assertLess(count, 100)
+        self.assertEqual(bitboard.count_solutions(grid, limit=count + 1), count)
+        self.assertEqual(bitboard.count_solutions(grid, limit=count - 1), count - 1)
+
+    def test_iter_solutions(self):
+        solutions = list(bitboard.iter_solutions(self.loose_grid()))
+        self.assertEqual(len(solutions), bitboard.count_solutions(self.loose_grid(), limit=100))
+        self.assertEqual(len(set(tuple(sorted(values.items())) for values in solutions)), len(solutions))
+        for values in solutions:
+            for unit in bitboard.UNIT_INDICES:
+                self.assertEqual(sorted(values[bitboard.BOXES[i]] for i in unit), list('123456789'))
+
+    def test_iter_solutions_is_lazy(self):
+        solutions = bitboard.iter_solutions('.' * 81)
+        first, second = next(solutions), next(solutions)
+        self.assertNotEqual(first, second)
+        self.assertEqual(list(bitboard.iter_solutions(benchmark.load_corpus('pathological')[-1])), [])
+
+if __name__ == '__main__':
+    unittest.main()
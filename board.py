@@ -36,42 +36,179 @@ def update_values(history, values, box, value):
 
     return new_values
 
+# ==== GEOMETRY ======================================================================
+
+# The characters for the values of a box, in order. A board of box size n uses
+# the first n * n, e.g. '123456789ABCDEFG' for 16x16.
+ALPHABET = '123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+# Rows are labeled with capital letters, which limits boards to 25x25
+ROW_LABELS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+MAX_BOX_SIZE = 5
+
+class Geometry:
+    """
+    The boxes, units and peers of a Diagonal Sudoku board, generated from the
+    size of its squares: 3 for the usual 9x9 board, 4 for 16x16, 5 for 25x25.
+
+    The attributes mirror the module constants below, which are those of the
+    9x9 board, e.g. `Geometry(4).PEER_INDICES` is `PEER_INDICES` for 16x16.
+    Use `get_geometry` rather than building one, so each is only built once.
+    """
+
+    def __init__(self, box_size, digits=None):
+        """
+        Args:
+            box_size(int): The width of a square, from 2 to `MAX_BOX_SIZE`
+            digits(string): The characters for the values of a box, by default
+                the start of `ALPHABET`
+        """
+        assert 2 <= box_size <= MAX_BOX_SIZE, "Box size must be from 2 to %d" % MAX_BOX_SIZE
+
+        n = self.BOX_SIZE = box_size
+        size = self.SIZE = n * n
+
+        self.DIGITS = digits or ALPHABET[:size]
+        assert len(self.DIGITS) == size, "A %dx%d board needs %d digits" % (size, size, size)
+
+        rows = self.ROWS = ROW_LABELS[:size]
+        cols = self.COLS = [str(c) for c in range(1, size + 1)]
+
+        self.BOXES = cross(rows, cols)
+
+        self.ROW_UNITS = [cross(r, cols) for r in rows]
+        self.COLUMN_UNITS = [cross(rows, [c]) for c in cols]
+        self.SQUARE_UNITS = [
+            cross(rows[r:r + n], cols[c:c + n])
+            for r in range(0, size, n)
+            for c in range(0, size, n)
+        ]
+        self.DIAGONAL_UNITS = [
+            [r + c for r, c in zip(rows, cols)],
+            [r + c for r, c in zip(rows[::-1], cols)],
+        ]
+        self.ALL_UNITS = self.ROW_UNITS + self.COLUMN_UNITS + self.SQUARE_UNITS + self.DIAGONAL_UNITS
+
+        self.UNITS_OF = dict((s, []) for s in self.BOXES)
+        for unit in self.ALL_UNITS:
+            for s in unit:
+                self.UNITS_OF[s].append(unit)
+
+        self.PEERS_OF = dict(
+            (s, set(p for u in self.UNITS_OF[s] for p in u) - set([s]))
+            for s in self.BOXES
+        )
+
+        self.INDEX_OF = dict((s, i) for i, s in enumerate(self.BOXES))
+        self.UNIT_INDICES = tuple(tuple(self.INDEX_OF[s] for s in u) for u in self.ALL_UNITS)
+
+        # Positions in `UNIT_INDICES` of the units of each box
+        unit_ids_of = [[] for _ in self.BOXES]
+        for k, unit in enumerate(self.UNIT_INDICES):
+            for i in unit:
+                unit_ids_of[i].append(k)
+
+        self.UNIT_IDS_OF = tuple(tuple(ids) for ids in unit_ids_of)
+        self.PEER_INDICES = tuple(
+            tuple(sorted(self.INDEX_OF[p] for p in self.PEERS_OF[s]))
+            for s in self.BOXES
+        )
+
+    def grid_to_values(self, grid):
+        """
+        Convert a grid string into a dict of {square: char}, with every digit
+        for empties.
+
+        Args:
+            grid(string) - A grid in string form, with '.' for empties.
+        """
+        assert len(grid) == len(self.BOXES), \
+            "Input grid must be a string of length %d (%dx%d)" % (len(self.BOXES), self.SIZE, self.SIZE)
+
+        return dict(zip(self.BOXES, [x if x != '.' else self.DIGITS for x in grid]))
+
+    def values_to_grid(self, values):
+        """
+        Convert a dict of {square: char} back into a grid string, with '.' for
+        any box which isn't solved.
+        """
+        return ''.join(
+            values[box] if len(values[box]) == 1 else '.'
+            for box in self.BOXES
+        )
+
+# The geometries built so far, by box size
+GEOMETRIES = {}
+
+def get_geometry(box_size=3):
+    """
+    Returns:
+        The `Geometry` of the default digits for a box size, built on first use.
+    """
+    geometry = GEOMETRIES.get(box_size)
+    if geometry is None:
+        geometry = GEOMETRIES[box_size] = Geometry(box_size)
+    return geometry
+
+def geometry_of(grid):
+    """
+    Returns:
+        The `Geometry` of a grid string or dict of values, by its number of boxes,
+        e.g. 256 for 16x16.
+    """
+    for box_size in range(2, MAX_BOX_SIZE + 1):
+        if box_size ** 4 == len(grid):
+            return get_geometry(box_size)
+
+    raise ValueError("A grid of %d boxes is not a square Sudoku board" % len(grid))
+
+# The usual 9x9 board, which the constants below describe.
+GEOMETRY = get_geometry(3)
+
 # Rows are labeled with capital letters
-ROWS = 'ABCDEFGHI'
+ROWS = GEOMETRY.ROWS
 
 # Columns are labeled with numbers
-COLS = '123456789'
+COLS = ''.join(GEOMETRY.COLS)
 
 # A box is a string of the form 'A1' or 'C5'
 # representing one box on the game board.
-BOXES = cross(ROWS, COLS)
+BOXES = GEOMETRY.BOXES
 
 # Units are groups of 9 squares which must contain one and only one of each
 # of the digits 1 through 9. 
 # 
 # They come in 4 flavors: row, column, square, and diagonal.
-ROW_UNITS = [cross(r, COLS) for r in ROWS]
+ROW_UNITS = GEOMETRY.ROW_UNITS
 
-COLUMN_UNITS = [cross(ROWS, c) for c in COLS]
+COLUMN_UNITS = GEOMETRY.COLUMN_UNITS
 
-SQUARE_UNITS = [
-    cross(rs, cs) 
-    for rs in ('ABC', 'DEF', 'GHI') 
-    for cs in ('123', '456', '789')
-]
+SQUARE_UNITS = GEOMETRY.SQUARE_UNITS
 
-DIAGONAL_UNITS = [
-    [''.join(x) for x in list(zip(ROWS, COLS))], 
-    [''.join(x) for x in list(zip(ROWS[::-1], COLS))]
-]
+DIAGONAL_UNITS = GEOMETRY.DIAGONAL_UNITS
 
-ALL_UNITS = ROW_UNITS + COLUMN_UNITS + SQUARE_UNITS + DIAGONAL_UNITS
+ALL_UNITS = GEOMETRY.ALL_UNITS
 
 # This dict maps from boxes -> lists of all the units to which a box belongs.
-UNITS_OF = dict((s, [u for u in ALL_UNITS if s in u]) for s in BOXES)
+UNITS_OF = GEOMETRY.UNITS_OF
 
 # The 'peers' of a given box are all the other boxes in the given box's units.
 # If a box has a known value, none of its peers may take the same value.
 
 # This dict maps from boxes -> peers of that box.
-PEERS_OF = dict((s, set(sum(UNITS_OF[s], [])) - set([s])) for s in BOXES)
\ No newline at end of file
+PEERS_OF = GEOMETRY.PEERS_OF
+
+# ==== INDEX TABLES ======================================================================
+
+# The tables below describe the same geometry by box index (0-80, in the order of
+# `BOXES`) rather than by box name, for engines backed by a flat 81-slot array.
+
+# This dict maps from boxes -> index of that box e.g. 'A1' -> 0, 'B1' -> 9
+INDEX_OF = GEOMETRY.INDEX_OF
+
+# Every unit, as a tuple of box indices
+UNIT_INDICES = GEOMETRY.UNIT_INDICES
+
+# For each box index, a sorted tuple of the indices of its peers
+PEER_INDICES = GEOMETRY.PEER_INDICES
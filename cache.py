@@ -0,0 +1,102 @@
+"""
+An in-process cache of Sudoku solutions.
+
+Puzzles are cached by the canonical form of their grid string from `symmetry`,
+so that a puzzle which is a relabelled, reflected or rotated copy of one solved
+earlier is a cache hit too. On a hit, the stored solution is mapped back through
+the inverse of the transform. The symmetries are only those of 9x9 grids, so
+larger grids are cached as they are.
+"""
+from collections import OrderedDict
+
+from batch import solve_grid
+from board import BOXES, geometry_of
+from symmetry import canonicalize, invert
+
+
+class SolutionCache:
+    """
+    A size-bounded cache of solutions, evicting the least recently used puzzle
+    once full.
+
+    Example:
+        cache = SolutionCache(maxsize=10000)
+        values = cache.solve(grid)
+        print(cache.hits, cache.misses)
+    """
+
+    def __init__(self, maxsize=1024, engine=None):
+        """
+        Args:
+            maxsize(int): The most puzzles to keep solutions for
+            engine(string): the name of the engine to solve with, see `solution.ENGINES`
+        """
+        self.maxsize = maxsize
+        self.engine = engine
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Canonical grid -> canonical solution grid, or False if there is none
+        self._solutions = OrderedDict()
+
+    def solve(self, grid):
+        """
+        Find the solution to a Sudoku grid, from the cache if possible.
+
+        Args:
+            grid(string): a string representing a sudoku grid.
+
+        Returns:
+            The dictionary representation of the final sudoku grid. False if no solution exists.
+        """
+        if len(grid) == 81:
+            canonical, transform = canonicalize(grid)
+        else:
+            canonical, transform = grid, None
+        solutions = self._solutions
+
+        if canonical in solutions:
+            self.hits += 1
+            solutions.move_to_end(canonical)
+            solved = solutions[canonical]
+        else:
+            self.misses += 1
+            solved = solve_grid(canonical, self.engine)
+
+            solutions[canonical] = solved
+            if len(solutions) > self.maxsize:
+                solutions.popitem(last=False)
+                self.evictions += 1
+
+        if solved and transform is None:
+            return dict(zip(geometry_of(solved).BOXES, solved))
+        elif solved:
+            return dict(zip(BOXES, invert(solved, transform)))
+        else:
+            return False
+
+    def clear(self):
+        """
+        Forget every cached solution, and reset the counters.
+        """
+        self._solutions.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """
+        Returns:
+            A dict of the cache counters, to help size the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._solutions),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._solutions)
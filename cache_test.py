@@ -0,0 +1,49 @@
+import solution_test
+import unittest
+from cache import SolutionCache
+
+
+class TestSolutionCache(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    solved_diag_sudoku = solution_test.TestDiagonalSudoku.solved_diag_sudoku
+
+    # The same puzzle with every digit d relabelled as 10 - d
+    relabelled = str.maketrans('123456789', '987654321')
+
+    def test_hits(self):
+        cache = SolutionCache(engine='bitmask')
+        self.assertEqual(cache.solve(self.diagonal_grid), self.solved_diag_sudoku)
+        self.assertEqual(cache.solve(self.diagonal_grid), self.solved_diag_sudoku)
+
+        relabelled = cache.solve(self.diagonal_grid.translate(self.relabelled))
+        self.assertEqual(relabelled, dict((box, value.translate(self.relabelled))
+                                          for box, value in self.solved_diag_sudoku.items()))
+        # The same puzzle, transposed
+        transposed = ''.join(self.diagonal_grid[9 * c + r] for r in range(9) for c in range(9))
+        solved = cache.solve(transposed)
+        self.assertEqual(solved['B1'], self.solved_diag_sudoku['A2'])
+
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_eviction(self):
+        cache = SolutionCache(maxsize=1, engine='bitmask')
+        cache.solve(self.diagonal_grid)
+        self.assertEqual(cache.solve('11' + '.' * 79), False)
+        cache.solve(self.diagonal_grid)
+        self.assertEqual(cache.info()['evictions'], 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_larger_grids(self):
+        grid = '.' * 256
+        cache = SolutionCache(engine='wide')
+        solved = cache.solve(grid)
+        self.assertEqual(cache.solve(grid), solved)
+        self.assertEqual(len(solved), 256)
+        self.assertEqual(len(solved['P16']), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        with self.assertRaises(ValueError):
+            SolutionCache(engine='bitmask').solve(grid)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+A command line solver for files of Diagonal Sudoku puzzles, one per line.
+
+Puzzles are read lazily from plain text files, gzip files, zip archives (every
+member in turn) or stdin, and solved as a generator pipeline, so memory use stays
+bounded however large the input. For each puzzle a tab separated line is written
+as soon as it is solved:
+
+    <puzzle>    <status>    <solution>
+
+where status is one of 'solved', 'unsolvable' or 'invalid', and the solution is
+'-' unless solved. A summary is written to stderr at the end.
+
+Puzzles of 256 or 625 chars are 16x16 or 25x25 boards, using the digits of
+`board.ALPHABET`. The default engine, 'auto', solves them with the wide engine
+and 9x9 puzzles with the bitmask one, see `solution.AUTO_ENGINES`. Engines which
+only solve 9x9 puzzles report larger ones as 'invalid'.
+
+Example:
+    python cli.py puzzles.txt.gz --workers 8 -o solutions.tsv
+"""
+import argparse
+import gzip
+import io
+import sys
+import time
+import zipfile
+from collections import deque
+
+import batch
+from board import geometry_of
+from solution import ENGINES, can_solve
+
+# The characters a puzzle line may hold besides the digits of its size. '0' is
+# accepted for an empty box, as many puzzle collections use it.
+EMPTY = '.0'
+
+def read_lines(path):
+    """
+    Lazily yield the lines of a text file, gzip file or zip archive, or of stdin
+    for '-'.
+
+    Args:
+        path(string): The path of the file to read
+
+    Yields:
+        Each line, without its line ending.
+    """
+    if path == '-':
+        yield from (line.rstrip('\r\n') for line in sys.stdin)
+        return
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                with archive.open(name) as member:
+                    text = io.TextIOWrapper(member, encoding='utf-8', errors='replace')
+                    yield from (line.rstrip('\r\n') for line in text)
+        return
+
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as lines:
+        yield from (line.rstrip('\r\n') for line in lines)
+
+def parse_grid(line):
+    """
+    Convert a puzzle line into a grid string.
+
+    Args:
+        line(string): A line holding a puzzle, e.g. '2.......6...'
+
+    Returns:
+        The grid in string form, with '.' for empties. None if the line is not a puzzle.
+    """
+    line = line.strip()
+
+    try:
+        digits = geometry_of(line).DIGITS
+    except ValueError:
+        return None
+
+    grid = ''.join('.' if x in EMPTY else x for x in line)
+    if not all(x == '.' or x in digits for x in grid):
+        return None
+
+    return grid
+
+def solve_lines(lines, workers=1, chunksize=64, engine='auto'):
+    """
+    Solve an iterable of puzzle lines, skipping blank lines and '#' comments.
+
+    Args:
+        lines(iterable): Lines, each holding a puzzle
+        workers(int): The number of worker processes, see `batch.solve_many`
+        chunksize(int): How many puzzles to send to a worker at a time
+        engine(string): the name of the engine to solve with, see `solution.ENGINES`,
+            or 'auto' (default) to pick one by the size of each puzzle
+
+    Yields:
+        (puzzle, status, solution) tuples, in input order. The solution is None
+        unless the status is 'solved'. Puzzles of a size the engine doesn't
+        solve, e.g. 16x16 with 'bitmask', are 'invalid'.
+    """
+    # Lines read ahead of the solver, as (line, grid) pairs. Invalid lines go
+    # through the solver as None grids too, so they come out in input order
+    # without piling up here while the solver waits for valid ones.
+    queue = deque()
+
+    def grids():
+        for line in lines:
+            if not line.strip() or line.startswith('#'):
+                continue
+
+            grid = parse_grid(line)
+            if grid is not None and not can_solve(grid, engine):
+                grid = None
+
+            queue.append((line, grid))
+            yield grid
+
+    for solved in batch.solve_many(grids(), workers=workers, chunksize=chunksize, engine=engine):
+        line, grid = queue.popleft()
+        if grid is None:
+            yield line, 'invalid', None
+        elif solved:
+            yield grid, 'solved', solved
+        else:
+            yield grid, 'unsolvable', None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Solve Diagonal Sudoku puzzles, one per line.')
+    parser.add_argument('paths', nargs='*', default=['-'],
+                        help='text, .gz or .zip files of puzzles, or - for stdin (default)')
+    parser.add_argument('-o', '--output', default='-',
+                        help='file to write the results to, or - for stdout (default)')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='number of worker processes, 0 for one per CPU (default 1)')
+    parser.add_argument('--chunksize', type=int, default=64,
+                        help='puzzles sent to a worker at a time (default 64)')
+    parser.add_argument('--engine', default='auto', choices=sorted(ENGINES) + ['auto'],
+                        help="engine to solve with, e.g. 'bitmask' or 'numpy' for 9x9 puzzles, "
+                             "or 'auto' (default) for 'bitmask' on 9x9 and 'wide' on larger ones")
+    args = parser.parse_args(argv)
+
+    lines = (line for path in args.paths for line in read_lines(path))
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+
+    counts = dict.fromkeys(('solved', 'unsolvable', 'invalid'), 0)
+    start = time.perf_counter()
+
+    try:
+        for puzzle, status, solution in solve_lines(lines, workers=args.workers or None,
+                                                    chunksize=args.chunksize, engine=args.engine):
+            counts[status] += 1
+            output.write('%s\t%s\t%s\n' % (puzzle, status, solution or '-'))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    total = counts['solved'] + counts['unsolvable']
+    print('%d solved, %d unsolvable, %d invalid in %.2fs (%.1f puzzles/s)' % (
+        counts['solved'], counts['unsolvable'], counts['invalid'],
+        elapsed, total / elapsed if elapsed else 0.0,
+    ), file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import cli
+import gzip
+import io
+import os
+import solution_test
+import tempfile
+import unittest
+import zipfile
+from contextlib import redirect_stderr
+from unittest import mock
+
+
+class TestSolveLines(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    lines = [
+        '# A comment, then a blank line',
+        '',
+        diagonal_grid.replace('.', '0'),
+        'not a puzzle',
+        # Two 1s in the first row
+        '11' + '.' * 79,
+    ]
+
+    def test_statuses(self):
+        results = list(cli.solve_lines(self.lines))
+        self.assertEqual([status for _, status, _ in results], ['solved', 'invalid', 'unsolvable'])
+        self.assertEqual(results[0][0], self.diagonal_grid)
+        self.assertNotIn('.', results[0][2])
+
+    def test_parallel(self):
+        self.assertEqual(list(cli.solve_lines(self.lines, workers=2, chunksize=1)),
+                         list(cli.solve_lines(self.lines)))
+
+    def test_invalid_lines_are_not_held_back(self):
+        read = []
+
+        def lines():
+            for i in range(100000):
+                read.append(i)
+                yield 'puzzle,solution'
+            yield self.diagonal_grid
+
+        results = cli.solve_lines(lines(), chunksize=64)
+        self.assertEqual(next(results), ('puzzle,solution', 'invalid', None))
+        self.assertLessEqual(len(read), 64)
+
+    def test_mixed_sizes(self):
+        grid_16x16 = '.' * 256
+        lines = [self.diagonal_grid, grid_16x16]
+
+        statuses = [status for _, status, _ in cli.solve_lines(lines)]
+        self.assertEqual(statuses, ['solved', 'solved'])
+
+        for engine in ('bitmask', 'numpy', 'dlx'):
+            results = list(cli.solve_lines(lines, engine=engine))
+            self.assertEqual([status for _, status, _ in results], ['solved', 'invalid'])
+            self.assertEqual(results[1][0], grid_16x16)
+
+    def test_main(self):
+        stdin = io.StringIO(self.diagonal_grid + '\n' + '.' * 256 + '\n')
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'solutions.tsv')
+            with mock.patch('sys.stdin', stdin), redirect_stderr(io.StringIO()) as summary:
+                cli.main(['--engine', 'bitmask', '-o', output])
+
+            with open(output) as f:
+                self.assertEqual([line.split('\t')[1] for line in f], ['solved', 'invalid'])
+        self.assertIn('1 solved, 0 unsolvable, 1 invalid', summary.getvalue())
+
+    def test_unknown_engine(self):
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            cli.main(['--engine', 'bitmsak'])
+
+
+class TestReadLines(unittest.TestCase):
+    lines = ['first', 'second']
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_gzip(self):
+        path = os.path.join(self.directory.name, 'puzzles.txt.gz')
+        with gzip.open(path, 'wt') as f:
+            f.write('\n'.join(self.lines) + '\n')
+        self.assertEqual(list(cli.read_lines(path)), self.lines)
+
+    def test_zip(self):
+        path = os.path.join(self.directory.name, 'puzzles.zip')
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('a.txt', 'first\n')
+            archive.writestr('b.txt', 'second\r\n')
+        self.assertEqual(list(cli.read_lines(path)), self.lines)
+
+if __name__ == '__main__':
+    unittest.main()
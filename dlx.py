@@ -0,0 +1,246 @@
+"""
+An exact cover engine for solving Diagonal Sudoku puzzles, using Knuth's
+Algorithm X with Dancing Links.
+
+A diagonal sudoku is encoded as an exact cover problem with 342 constraint
+columns, each of which must be covered exactly once:
+
+    * 81 box constraints: every box holds a digit
+    * 81 row, 81 column and 81 square constraints: every unit holds each digit
+    * 18 diagonal constraints: each of the two diagonals in `DIAGONAL_UNITS`
+      holds each digit. As a diagonal has 9 boxes for 9 digits, these are
+      primary constraints like the others.
+
+and 729 candidate rows, one per (box, digit) pair, covering the constraints that
+placing the digit in the box satisfies. Solving picks a set of rows covering
+every column exactly once, always branching on the column with the fewest rows
+left.
+"""
+from board import BOXES, ROW_UNITS, COLUMN_UNITS, SQUARE_UNITS, DIAGONAL_UNITS
+
+DIGITS = '123456789'
+
+def constraints():
+    """
+    Returns:
+        The number of constraint columns, and for each of the 729 candidate
+        rows, in (box index, digit index) order, the columns it covers.
+    """
+    # For each box, the first of the 9 digit columns of each unit it belongs to.
+    # The box constraints come first.
+    unit_columns = dict((box, []) for box in BOXES)
+    offset = len(BOXES)
+
+    for units in (ROW_UNITS, COLUMN_UNITS, SQUARE_UNITS, DIAGONAL_UNITS):
+        for unit in units:
+            for box in unit:
+                unit_columns[box].append(offset)
+            offset += len(DIGITS)
+
+    rows = [
+        [i] + [first + d for first in unit_columns[box]]
+        for i, box in enumerate(BOXES)
+        for d in range(len(DIGITS))
+    ]
+
+    return offset, rows
+
+class DancingLinks:
+    """
+    The toroidal doubly linked lists of Algorithm X, held in flat lists of node
+    indices rather than as node objects.
+
+    Node 0 is the root, nodes 1 to `n_columns` are the column headers, and the
+    rest are the 1s of the matrix. `L`, `R`, `U` and `D` link each node to its
+    neighbours, `C` to its column header, and `row` to its candidate row. `S`
+    counts the nodes left in each column.
+    """
+    __slots__ = ('L', 'R', 'U', 'D', 'C', 'S', 'row')
+
+    def __init__(self, n_columns, rows):
+        nodes = n_columns + 1
+        L = list(range(-1, nodes - 1))
+        R = list(range(1, nodes + 1))
+        L[0] = n_columns
+        R[n_columns] = 0
+        U = list(range(nodes))
+        D = list(range(nodes))
+        C = list(range(nodes))
+        S = [0] * nodes
+        row_of = [-1] * nodes
+
+        for r, columns in enumerate(rows):
+            first = len(C)
+            for column in columns:
+                c = column + 1
+                node = len(C)
+                # Append the node at the bottom of its column
+                U.append(U[c])
+                D.append(c)
+                D[U[c]] = node
+                U[c] = node
+                C.append(c)
+                S[c] += 1
+                row_of.append(r)
+                # and at the end of its row
+                L.append(node - 1 if node > first else node)
+                R.append(first)
+                if node > first:
+                    R[node - 1] = node
+                    L[first] = node
+
+        self.L, self.R, self.U, self.D, self.C, self.S, self.row = L, R, U, D, C, S, row_of
+
+    def copy(self):
+        links = DancingLinks.__new__(DancingLinks)
+        links.L, links.R, links.U, links.D = self.L[:], self.R[:], self.U[:], self.D[:]
+        links.C, links.S, links.row = self.C, self.S[:], self.row
+        return links
+
+    def cover(self, c):
+        """
+        Remove column `c`, and every row covering it, from the matrix.
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, c):
+        """
+        Undo `cover(c)`, restoring the links in reverse order.
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+
+    def select(self, node):
+        """
+        Choose the row of `node`, covering every column of that row.
+        """
+        self.cover(self.C[node])
+        j = self.R[node]
+        while j != node:
+            self.cover(self.C[j])
+            j = self.R[j]
+
+N_COLUMNS, ROWS = constraints()
+
+# The empty board's matrix, copied for every puzzle rather than built again
+TEMPLATE = DancingLinks(N_COLUMNS, ROWS)
+
+# The first node of each candidate row
+FIRST_NODE = [0] * len(ROWS)
+for node in range(len(TEMPLATE.C) - 1, N_COLUMNS, -1):
+    FIRST_NODE[TEMPLATE.row[node]] = node
+
+def search(links, solution):
+    """
+    Algorithm X: cover every remaining column, always branching on the column
+    with the fewest rows left.
+
+    Args:
+        links(DancingLinks): The remaining exact cover matrix
+        solution(list): The candidate rows chosen so far, appended to in place
+
+    Returns:
+        True once every column is covered, with `solution` holding the rows
+        chosen. False if there is no exact cover.
+    """
+    R, D, S = links.R, links.D, links.S
+
+    if R[0] == 0:
+        return True
+
+    # Choose the column with the fewest rows left
+    c = R[0]
+    best = c
+    while c != 0:
+        if S[c] < S[best]:
+            best = c
+            if S[c] <= 1:
+                break
+        c = R[c]
+
+    L, C = links.L, links.C
+    cover, uncover = links.cover, links.uncover
+
+    cover(best)
+
+    node = D[best]
+    while node != best:
+        # Try the row of this node, covering the rest of its columns
+        solution.append(links.row[node])
+        j = R[node]
+        while j != node:
+            cover(C[j])
+            j = R[j]
+
+        if search(links, solution):
+            return True
+
+        solution.pop()
+        j = L[node]
+        while j != node:
+            uncover(C[j])
+            j = L[j]
+
+        node = D[node]
+
+    uncover(best)
+    return False
+
+def solve(grid):
+    """
+    Find the solution to a Sudoku grid.
+
+    Args:
+        grid(string): a string representing a sudoku grid.
+            Example: '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    Returns:
+        The dictionary representation of the final sudoku grid. False if no solution exists.
+    """
+    assert len(grid) == 81, "Input grid must be a string of length 81 (9x9)"
+
+    links = TEMPLATE.copy()
+
+    # Place the givens. A given whose constraints are already covered clashes
+    # with an earlier one.
+    covered = set()
+    for i, x in enumerate(grid):
+        if x != '.':
+            r = i * len(DIGITS) + DIGITS.index(x)
+            if covered.intersection(ROWS[r]):
+                return False
+            covered.update(ROWS[r])
+            links.select(FIRST_NODE[r])
+
+    solution = []
+    if not search(links, solution):
+        return False
+
+    values = dict((box, x) for box, x in zip(BOXES, grid))
+    for r in solution:
+        values[BOXES[r // len(DIGITS)]] = DIGITS[r % len(DIGITS)]
+
+    return values
@@ -0,0 +1,29 @@
+import benchmark
+import bitboard
+import dlx
+import solution
+import solution_test
+import unittest
+
+
+class TestDancingLinks(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    solved_diag_sudoku = solution_test.TestDiagonalSudoku.solved_diag_sudoku
+
+    def test_encoding(self):
+        # 81 box, 3 * 81 unit and 18 diagonal constraints
+        self.assertEqual(dlx.N_COLUMNS, 342)
+        self.assertEqual(len(dlx.ROWS), 729)
+        # Every constraint is covered by exactly 9 candidates
+        self.assertEqual(sum(len(row) for row in dlx.ROWS), 342 * 9)
+
+    def test_solve(self):
+        self.assertEqual(solution.solve(self.diagonal_grid, engine='dlx'), self.solved_diag_sudoku)
+
+    def test_unsolvable(self):
+        self.assertEqual(dlx.solve('11' + '.' * 79), False)
+        for grid in benchmark.load_corpus('pathological'):
+            self.assertEqual(dlx.solve(grid), bitboard.solve(grid))
+
+if __name__ == '__main__':
+    unittest.main()
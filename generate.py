@@ -0,0 +1,209 @@
+"""
+A generator of minimal Diagonal Sudoku puzzles with a unique solution.
+
+Each puzzle starts from a random full diagonal grid, found by the bitmask solver
+searching an empty grid with random variable and value orders. Clues are then
+removed in a random order, each one only if the puzzle keeps a unique solution.
+A clue which can't be removed now can't be removed later either, as taking more
+clues away only adds solutions, so a single pass leaves a minimal puzzle.
+
+The uniqueness check doesn't count solutions. As the full grid is known, the
+puzzle without clue `d` in box `i` is unique exactly if there is no solution with
+something other than `d` in box `i`, which is a single search of a board with
+`d` ruled out of `i`.
+
+Every puzzle has its own seed, made from the run's seed and its position, so a
+run is reproducible whatever the number of workers.
+
+Larger boards, e.g. 16x16 with `--box-size 4`, are generated the same way with
+the engine of `wideboard.py`. A few of their checks can take very long searches,
+so each one gets `MAX_CHECK_NODES` nodes, and a clue whose check runs out is
+kept. Such puzzles still have a unique solution, but may not be quite minimal.
+
+Example:
+    python generate.py -n 100 --seed 1 --workers 4 -o puzzles.txt
+    python generate.py -n 10 --box-size 4
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import wideboard
+from bitboard import Board, Solver, BIT_OF, DIGITS_OF, ALL_DIGITS, reduce_puzzle
+from board import get_geometry
+from heuristics import get_heuristics
+
+# The nodes a uniqueness check on a board other than 9x9 may take, after which
+# the clue is kept
+MAX_CHECK_NODES = 200
+
+def random_solution(seed, box_size=3):
+    """
+    Returns:
+        A random full diagonal grid, as an 81-char string for the default box size.
+    """
+    if box_size != 3:
+        return random_wide_solution(seed, box_size)
+
+    board = reduce_puzzle(Board.from_grid('.' * 81))
+    Solver(board, *get_heuristics('random', 'random', seed)).run()
+    return ''.join(DIGITS_OF[mask] for mask in board.cells)
+
+def has_other_solution(grid, i, digit):
+    """
+    Check whether a grid has a solution other than `digit` in box `i`.
+
+    Args:
+        grid(string): a string representing a sudoku grid, with box `i` empty
+        i(int): The index of the box
+        digit(string): The digit to rule out of box `i`
+
+    Returns:
+        True if such a solution exists.
+    """
+    board = Board.from_grid(grid)
+    board.cells[i] = ALL_DIGITS & ~BIT_OF[digit]
+    board = reduce_puzzle(board)
+
+    return bool(board) and Solver(board).run()
+
+def random_wide_solution(seed, box_size):
+    """
+    Search an empty board of any size with random candidate orders. Those searches
+    sometimes go astray for a long time, so each one gets a budget of nodes and
+    is restarted with a new order and twice the budget once it runs out.
+
+    Returns:
+        A random full diagonal grid string.
+    """
+    rng = random.Random(seed)
+    empty = '.' * len(get_geometry(box_size).BOXES)
+    max_nodes = MAX_CHECK_NODES
+
+    while True:
+        solver = wideboard.make_solver(empty, rng.random())
+        if solver.run(max_nodes):
+            return solver.board.to_grid()
+        max_nodes *= 2
+
+def has_other_wide_solution(grid, i, digit, max_nodes=MAX_CHECK_NODES):
+    """
+    `has_other_solution` for a grid of any size, which gives up after `max_nodes`
+    search nodes.
+
+    Returns:
+        True if such a solution exists, or if the search gave up.
+    """
+    board = wideboard.Board.from_grid(grid)
+    board.cells[i] = board.all_digits & ~(1 << board.geometry.DIGITS.index(digit))
+    board = wideboard.reduce_puzzle(board)
+
+    return bool(board) and wideboard.Solver(board).run(max_nodes) is not False
+
+def minimize(grid, seed=None):
+    """
+    Remove clues from a grid in a random order, keeping each one whose removal
+    would leave more than one solution.
+
+    Args:
+        grid(string): a grid with a unique solution, e.g. a full grid
+        seed: Seed for the order in which clues are tried
+
+    Returns:
+        A minimal grid string with the same unique solution.
+    """
+    rng = random.Random(seed)
+    puzzle = list(grid)
+    check = has_other_solution if len(grid) == 81 else has_other_wide_solution
+
+    order = [i for i, x in enumerate(grid) if x != '.']
+    rng.shuffle(order)
+
+    for i in order:
+        digit = puzzle[i]
+        puzzle[i] = '.'
+        if check(''.join(puzzle), i, digit):
+            puzzle[i] = digit
+
+    return ''.join(puzzle)
+
+def generate_puzzle(seed, box_size=3):
+    """
+    Generate a single minimal puzzle.
+
+    Args:
+        seed: Seed for the full grid and for the order clues are removed in
+        box_size(int): The width of a square, e.g. 4 for 16x16
+
+    Returns:
+        The puzzle as a grid string, of 81 chars for the default box size.
+    """
+    return minimize(random_solution(seed, box_size), seed)
+
+def generate(count, seed=None, workers=1, box_size=3):
+    """
+    Generate minimal puzzles with a unique solution.
+
+    Args:
+        count(int): The number of puzzles to generate
+        seed: Seed for the run. By default a random one.
+        workers(int): The number of worker processes, None for one per CPU.
+            With 1 worker every puzzle is generated in this process.
+        box_size(int): The width of a square, e.g. 4 for 16x16
+
+    Yields:
+        The puzzles as grid strings, in the same order for the same seed.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    seeds = ['%s:%d' % (seed, n) for n in range(count)]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1:
+        for puzzle_seed in seeds:
+            yield generate_puzzle(puzzle_seed, box_size)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(partial(generate_puzzle, box_size=box_size), seeds, chunksize=max(1, count // (workers * 4)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate minimal Diagonal Sudoku puzzles.')
+    parser.add_argument('-n', '--count', type=int, default=10,
+                        help='number of puzzles to generate (default 10)')
+    parser.add_argument('--seed', help='seed for a reproducible run (default random)')
+    parser.add_argument('-o', '--output', default='-',
+                        help='file to write the puzzles to, or - for stdout (default)')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='number of worker processes, 0 for one per CPU (default 1)')
+    parser.add_argument('--box-size', type=int, default=3,
+                        help='width of a square, e.g. 4 for 16x16 puzzles (default 3)')
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    start = time.perf_counter()
+    clues = 0
+
+    try:
+        for puzzle in generate(args.count, args.seed, args.workers or None, args.box_size):
+            clues += len(puzzle) - puzzle.count('.')
+            output.write(puzzle + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print('%d puzzles, %.1f clues on average, in %.2fs (%.1f puzzles/s)' % (
+        args.count, clues / args.count if args.count else 0.0,
+        elapsed, args.count / elapsed if elapsed else 0.0,
+    ), file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
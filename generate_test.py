@@ -0,0 +1,35 @@
+import bitboard
+import generate
+import unittest
+import wideboard
+
+
+class TestGenerate(unittest.TestCase):
+    def test_random_solution(self):
+        grid = generate.random_solution(0)
+        self.assertNotIn('.', grid)
+        self.assertEqual(bitboard.count_solutions(grid), 1)
+        self.assertNotEqual(grid, generate.random_solution(1))
+
+    def test_minimal_and_unique(self):
+        puzzle = generate.generate_puzzle(0)
+        self.assertEqual(bitboard.count_solutions(puzzle), 1)
+        for i, x in enumerate(puzzle):
+            if x != '.':
+                self.assertEqual(bitboard.count_solutions(puzzle[:i] + '.' + puzzle[i + 1:]), 2)
+
+    def test_larger_boards(self):
+        # 4x4, with squares of 2x2, is quick to check exhaustively
+        puzzle = generate.generate_puzzle(0, box_size=2)
+        self.assertEqual(len(puzzle), 16)
+        self.assertEqual(wideboard.count_solutions(puzzle), 1)
+        for i, x in enumerate(puzzle):
+            if x != '.':
+                self.assertEqual(wideboard.count_solutions(puzzle[:i] + '.' + puzzle[i + 1:]), 2)
+
+    def test_reproducible(self):
+        self.assertEqual(list(generate.generate(3, seed=5)), list(generate.generate(3, seed=5, workers=2)))
+        self.assertNotEqual(list(generate.generate(3, seed=5)), list(generate.generate(3, seed=6)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+"""
+Variable and value ordering heuristics for the bitmask `Solver`.
+
+A variable order picks the unfilled box to guess next, and a value order the order
+in which to try its candidates. They only change the shape of the search tree, never
+the solution of a puzzle with a unique one, but the node counts of hard puzzles vary
+widely between them.
+
+Variable orders:
+
+    * 'mrv': the box with the fewest candidates, ties going to the first box.
+      This is what `search` has always done.
+    * 'mrv-degree': the fewest candidates, ties going to the box with the most
+      unfilled peers.
+    * 'dom-wdeg': the smallest ratio of candidates to the weight of the box's
+      units, where a unit's weight counts the failed guesses within it.
+    * 'random': the fewest candidates, ties broken at random.
+
+Value orders:
+
+    * 'ordered': digit order.
+    * 'lcv': least constraining value first, i.e. the candidate found in the
+      fewest unfilled peers.
+    * 'random': a random order.
+
+Example:
+    bitboard.solve(grid, variable='mrv-degree', value='lcv')
+"""
+import random
+
+from bitboard import POPCOUNT, BITS_OF, UNIT_IDS_OF
+from board import UNIT_INDICES, PEER_INDICES
+
+
+# ==== VARIABLE ORDERS ======================================================================
+
+class MRV:
+    """
+    Choose the box with the fewest candidates, ties going to the first box.
+    """
+
+    def __init__(self, seed=None):
+        pass
+
+    def select(self, board):
+        """
+        Returns:
+            The index of the unfilled box to guess next, or None if the board is solved.
+        """
+        cells = board.cells
+        unsolved = [
+            (POPCOUNT[cells[i]], i)
+            for i in range(len(cells))
+            if POPCOUNT[cells[i]] > 1
+        ]
+
+        if not unsolved:
+            return None
+
+        return min(unsolved)[1]
+
+    def failed(self, board, i):
+        """
+        Called when a guess on box `i` fails to propagate.
+        """
+        pass
+
+class MRVDegree(MRV):
+    """
+    Choose the box with the fewest candidates, ties going to the box with the
+    most unfilled peers, as it constrains the most of the rest of the board.
+    """
+
+    def select(self, board):
+        cells = board.cells
+        fewest = min(
+            (POPCOUNT[mask] for mask in cells if POPCOUNT[mask] > 1),
+            default=None,
+        )
+
+        if fewest is None:
+            return None
+
+        return max(
+            (i for i in range(len(cells)) if POPCOUNT[cells[i]] == fewest),
+            key=lambda i: (sum(1 for peer in PEER_INDICES[i] if POPCOUNT[cells[peer]] > 1), -i),
+        )
+
+class DomWdeg(MRV):
+    """
+    Choose the box with the smallest ratio of candidates to weighted degree.
+
+    Every unit starts with a weight of 1, and the units of a box gain 1 each
+    time a guess on that box fails, so the search is drawn to the parts of the
+    board that keep failing.
+    """
+
+    def __init__(self, seed=None):
+        self.weights = [1] * len(UNIT_INDICES)
+
+    def select(self, board):
+        cells = board.cells
+        weights = self.weights
+        unsolved = [
+            (POPCOUNT[cells[i]] / sum(weights[k] for k in UNIT_IDS_OF[i]), i)
+            for i in range(len(cells))
+            if POPCOUNT[cells[i]] > 1
+        ]
+
+        if not unsolved:
+            return None
+
+        return min(unsolved)[1]
+
+    def failed(self, board, i):
+        for k in UNIT_IDS_OF[i]:
+            self.weights[k] += 1
+
+class RandomMRV(MRV):
+    """
+    Choose one of the boxes with the fewest candidates at random.
+    """
+
+    def __init__(self, seed=None):
+        self.random = random.Random(seed)
+
+    def select(self, board):
+        cells = board.cells
+        fewest = min(
+            (POPCOUNT[mask] for mask in cells if POPCOUNT[mask] > 1),
+            default=None,
+        )
+
+        if fewest is None:
+            return None
+
+        return self.random.choice([i for i in range(len(cells)) if POPCOUNT[cells[i]] == fewest])
+
+
+# ==== VALUE ORDERS ======================================================================
+
+class Ordered:
+    """
+    Try the candidates of a box in digit order.
+    """
+
+    def __init__(self, seed=None):
+        pass
+
+    def order(self, board, i):
+        """
+        Returns:
+            The candidate bits of box `i`, in the order to try them.
+        """
+        return list(BITS_OF[board.cells[i]])
+
+class LeastConstraining(Ordered):
+    """
+    Try first the candidates which rule out the fewest candidates of the
+    unfilled peers, as they leave the most room for a solution.
+    """
+
+    def order(self, board, i):
+        cells = board.cells
+        peers = [cells[peer] for peer in PEER_INDICES[i] if POPCOUNT[cells[peer]] > 1]
+
+        return sorted(
+            BITS_OF[cells[i]],
+            key=lambda bit: sum(1 for mask in peers if mask & bit),
+        )
+
+class RandomOrder(Ordered):
+    """
+    Try the candidates of a box in a random order.
+    """
+
+    def __init__(self, seed=None):
+        self.random = random.Random(seed)
+
+    def order(self, board, i):
+        bits = list(BITS_OF[board.cells[i]])
+        self.random.shuffle(bits)
+        return bits
+
+
+VARIABLE_ORDERS = {
+    'mrv': MRV,
+    'mrv-degree': MRVDegree,
+    'dom-wdeg': DomWdeg,
+    'random': RandomMRV,
+}
+
+VALUE_ORDERS = {
+    'ordered': Ordered,
+    'lcv': LeastConstraining,
+    'random': RandomOrder,
+}
+
+def get_heuristics(variable=None, value=None, seed=None):
+    """
+    Create the heuristics for a single solve. They may keep state, e.g. dom/wdeg
+    weights, so are not shared between solves.
+
+    Args:
+        variable(string): The name of a variable order in `VARIABLE_ORDERS`, default 'mrv'
+        value(string): The name of a value order in `VALUE_ORDERS`, default 'ordered'
+        seed: Seed for the random orders, for repeatable searches
+
+    Returns:
+        The variable order and value order, as a pair.
+    """
+    return (
+        VARIABLE_ORDERS[variable or 'mrv'](seed),
+        VALUE_ORDERS[value or 'ordered'](seed),
+    )
@@ -0,0 +1,53 @@
+import benchmark
+import bitboard
+import heuristics
+import solution
+import solution_test
+import unittest
+
+
+class TestHeuristics(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    solved_diag_sudoku = solution_test.TestDiagonalSudoku.solved_diag_sudoku
+
+    def test_every_heuristic_solves(self):
+        for variable in heuristics.VARIABLE_ORDERS:
+            for value in heuristics.VALUE_ORDERS:
+                self.assertEqual(
+                    solution.solve(self.diagonal_grid, engine='bitmask', variable=variable, value=value, seed=1),
+                    self.solved_diag_sudoku,
+                    "%s/%s found a different solution" % (variable, value))
+
+    def test_unsolvable(self):
+        for grid in benchmark.load_corpus('pathological')[-3:]:
+            self.assertEqual(bitboard.solve(grid, variable='dom-wdeg', value='lcv'), False)
+
+    def test_mrv_degree(self):
+        # E5 is on both diagonals, so has more unfilled peers than A2
+        board = bitboard.Board.from_grid('.' * 81)
+        board.cells[1] = board.cells[40] = bitboard.mask_of('12')
+        self.assertEqual(heuristics.MRV().select(board), 1)
+        self.assertEqual(heuristics.MRVDegree().select(board), 40)
+
+    def test_lcv(self):
+        # 1 is still a candidate of a peer of A1, 2 isn't
+        board = bitboard.Board.from_grid('.' * 81)
+        board.cells[0] = bitboard.mask_of('12')
+        for i in bitboard.PEER_INDICES[0]:
+            board.cells[i] = bitboard.mask_of('3456789')
+        board.cells[1] = bitboard.mask_of('13')
+        variable, value = heuristics.get_heuristics(value='lcv')
+        self.assertEqual(value.order(board, 0), [bitboard.BIT_OF['2'], bitboard.BIT_OF['1']])
+
+    def test_random_is_seeded(self):
+        grid = benchmark.load_corpus('hard')[0]
+        nodes = []
+        for attempt in range(2):
+            board = bitboard.reduce_puzzle(bitboard.Board.from_grid(grid))
+            solver = bitboard.Solver(board, *heuristics.get_heuristics('random', 'random', seed=7))
+            solver.run()
+            nodes.append(solver.nodes)
+        self.assertEqual(nodes[0], nodes[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+This module records the history of board states visited while solving a sudoku.
+"""
+
+class AssignmentHistory:
+    """
+    A history of board states, which can be used in place of the `assignments`
+    list of board dicts.
+
+    Rather than keeping a full copy of the board for every assignment, only the
+    first board is copied. Every later board is stored as a packed delta against
+    the one before it, a flat tuple of the form ('A1', '3', 'B2', '45', ...)
+    holding just the boxes whose values changed. Boards are rebuilt on demand by
+    replaying those deltas.
+
+    Boards must not be mutated after being appended, as is the case with those
+    produced by `update_values`, since only the latest one is kept to diff
+    against.
+    """
+
+    def __init__(self, frames=()):
+        self._base = None
+        self._deltas = []
+        self._last = None
+
+        for values in frames:
+            self.append(values)
+
+    def append(self, values):
+        """
+        Record a new board state.
+
+        Args:
+            values(dict): The dict storing the game state
+        """
+        last = self._last
+
+        if last is None:
+            self._base = dict(values)
+        else:
+            delta = []
+            for box, value in values.items():
+                if value != last[box]:
+                    delta += (box, value)
+            self._deltas.append(tuple(delta))
+
+        self._last = values
+
+    def clear(self):
+        """
+        Forget every recorded board state.
+        """
+        self.__init__()
+
+    def __len__(self):
+        if self._base is None:
+            return 0
+        return 1 + len(self._deltas)
+
+    def __iter__(self):
+        """
+        Replay the history, yielding a fresh copy of each board state in turn.
+        Only the board being rebuilt is kept in memory.
+        """
+        if self._base is None:
+            return
+
+        values = dict(self._base)
+        yield dict(values)
+
+        for delta in self._deltas:
+            for i in range(0, len(delta), 2):
+                values[delta[i]] = delta[i + 1]
+            yield dict(values)
+
+    def __getitem__(self, index):
+        """
+        Rebuild a single board state, by replaying the history up to it.
+
+        Args:
+            index(int): The position of the board state, negative to count from the end
+
+        Returns:
+            A copy of the board state at that position.
+        """
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('history index out of range')
+
+        values = dict(self._base)
+        for delta in self._deltas[:index]:
+            for i in range(0, len(delta), 2):
+                values[delta[i]] = delta[i + 1]
+
+        return values
@@ -0,0 +1,35 @@
+import solution
+import unittest
+from history import AssignmentHistory
+
+
+class TestAssignmentHistory(unittest.TestCase):
+    diagonal_grid = '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    def setUp(self):
+        # Record the same solve as a plain list of copies, and as deltas
+        self.frames = []
+        self.history = AssignmentHistory()
+
+        values = solution.convert_grid_string_to_dict(self.diagonal_grid)
+        for strategy in solution.KNOWN_STRATEGIES:
+            values = strategy(values, self.frames)
+        for frame in self.frames:
+            self.history.append(frame)
+
+    def test_replay(self):
+        self.assertEqual(len(self.history), len(self.frames))
+        self.assertEqual(list(self.history), self.frames)
+
+    def test_getitem(self):
+        self.assertEqual(self.history[0], self.frames[0])
+        self.assertEqual(self.history[-1], self.frames[-1])
+        self.assertEqual(self.history[len(self.frames) // 2], self.frames[len(self.frames) // 2])
+
+    def test_solve_records_history(self):
+        solution.assignments.clear()
+        solved = solution.solve(self.diagonal_grid)
+        self.assertEqual(solution.assignments[-1], solved)
+
+if __name__ == '__main__':
+    unittest.main()
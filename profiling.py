@@ -0,0 +1,94 @@
+"""
+This module collects statistics on the constraint propagation strategies, to
+tell which of them pay for themselves.
+
+Pass a `StrategyProfile` to `solve` in `solution.py` or `solution_2.py`:
+
+    profile = StrategyProfile()
+    solution.solve(grid, profile=profile)
+    print(profile.format_report())
+
+Without a profile, `reduce_puzzle` skips all of this.
+"""
+
+class StrategyProfile:
+    """
+    Per-strategy statistics, recorded around every strategy call in `reduce_puzzle`.
+
+    For each strategy it keeps the number of calls, the wall time spent in
+    them, how many candidates they eliminated and how many boxes they solved.
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def record(self, name, seconds, before, after):
+        """
+        Record a single strategy call.
+
+        Args:
+            name(string): The name of the strategy
+            seconds(float): The wall time the call took
+            before(dict): The game state the strategy was given
+            after(dict): The game state the strategy returned
+        """
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = dict.fromkeys(('calls', 'seconds', 'eliminated', 'solved'), 0)
+
+        stats['calls'] += 1
+        stats['seconds'] += seconds
+
+        if after is not before:
+            stats['eliminated'] += count_candidates(before) - count_candidates(after)
+            stats['solved'] += count_solved(after) - count_solved(before)
+
+    def report(self):
+        """
+        Returns:
+            A list with a dict of statistics per strategy, slowest first. Besides
+            the totals, each has the average time per call, and the candidates
+            eliminated per millisecond.
+        """
+        report = []
+
+        for name, stats in self.stats.items():
+            entry = dict(stats, name=name)
+            entry['seconds_per_call'] = stats['seconds'] / stats['calls']
+            entry['eliminated_per_ms'] = stats['eliminated'] / (stats['seconds'] * 1000) if stats['seconds'] else 0.0
+            report.append(entry)
+
+        return sorted(report, key=lambda entry: entry['seconds'], reverse=True)
+
+    def format_report(self):
+        """
+        Returns:
+            The report as a printable table.
+        """
+        lines = ['%-16s %8s %10s %12s %8s %14s' % ('strategy', 'calls', 'ms', 'eliminated', 'solved', 'eliminated/ms')]
+
+        for entry in self.report():
+            lines.append('%-16s %8d %10.2f %12d %8d %14.1f' % (
+                entry['name'], entry['calls'], entry['seconds'] * 1000,
+                entry['eliminated'], entry['solved'], entry['eliminated_per_ms'],
+            ))
+
+        return '\n'.join(lines)
+
+def count_candidates(values):
+    """
+    Returns:
+        The total number of candidates left over every box, or 0 for a failed board.
+    """
+    if not values:
+        return 0
+    return sum(len(value) for value in values.values())
+
+def count_solved(values):
+    """
+    Returns:
+        The number of boxes with precisely one possible value, or 0 for a failed board.
+    """
+    if not values:
+        return 0
+    return sum(1 for value in values.values() if len(value) == 1)
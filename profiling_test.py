@@ -0,0 +1,35 @@
+import solution
+import solution_2
+import unittest
+from profiling import StrategyProfile
+from strategies import get_plugins
+
+
+class TestStrategyProfile(unittest.TestCase):
+    diagonal_grid = '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    def check(self, module, strategies):
+        profile = StrategyProfile()
+        module.solve(self.diagonal_grid, profile=profile)
+        report = dict((entry['name'], entry) for entry in profile.report())
+
+        self.assertEqual(set(report), set(s.__name__ for s in strategies))
+        self.assertGreater(report['elimination']['eliminated'], 0)
+        # Which strategy solves a box depends on the order the scheduler runs them in
+        self.assertGreater(sum(entry['solved'] for entry in report.values()), 0)
+        for entry in report.values():
+            self.assertGreater(entry['calls'], 0)
+            self.assertGreater(entry['seconds'], 0)
+
+    def test_solution(self):
+        self.check(solution, solution.KNOWN_STRATEGIES)
+
+    def test_solution_2(self):
+        self.check(solution_2, get_plugins())
+
+    def test_engine(self):
+        with self.assertRaises(ValueError):
+            solution.solve(self.diagonal_grid, engine='bitmask', profile=StrategyProfile())
+
+if __name__ == '__main__':
+    unittest.main()
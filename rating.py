@@ -0,0 +1,135 @@
+"""
+Difficulty ratings for Diagonal Sudoku puzzles.
+
+A puzzle is rated by the techniques it takes to solve. Every strategy registered
+in `strategies`, enabled or not, is put on a ladder, basic strategies first and
+then cheapest first, as the scheduler of `solution_2.py` would run them. The
+puzzle is then solved the way a person would: each step applies the lowest
+strategy on the ladder which makes progress, so a harder technique only counts
+as required if nothing easier would do. If the ladder stalls short of a
+solution, the puzzle is searched with the bitmask engine, counting nodes and
+backtracks.
+
+Example:
+    rating = rate(grid)
+    print(rating['difficulty'], rating['score'], rating['hardest'])
+"""
+from math import log2
+
+from bitboard import Board, Solver, propagate
+from strategies import get_plugins
+from utils import convert_grid_string_to_dict
+
+# The highest scores of the difficulties reached by propagation alone, by the
+# strategies' positions on the ladder. The rest are set by `difficulty`, from the
+# size of the ladder: 'hard' takes any other strategy, 'expert' needs search but
+# at most 63 failed guesses, and 'extreme' anything more.
+DIFFICULTIES = [
+    (1, 'easy'),
+    (2, 'medium'),
+]
+
+# The most failed guesses of an 'expert' puzzle
+EXPERT_BACKTRACKS = 63
+
+def get_ladder():
+    """
+    Returns:
+        Every registered strategy, in the order they are tried: by tier, then by cost.
+    """
+    return sorted(get_plugins(enabled=False), key=lambda plugin: (plugin.tier, plugin.cost))
+
+def difficulty(score, size=None):
+    """
+    Args:
+        score(number): A score from `rate`
+        size(int): The number of strategies on the ladder, by default the
+            current length of `get_ladder()`
+
+    Returns:
+        The name of the difficulty of a score, e.g. 'medium'.
+    """
+    if size is None:
+        size = len(get_ladder())
+
+    for highest, name in DIFFICULTIES + [
+        (size, 'hard'),
+        (size + 1 + log2(1 + EXPERT_BACKTRACKS), 'expert'),
+    ]:
+        if score <= highest:
+            return name
+
+    return 'extreme'
+
+def rate(grid):
+    """
+    Rate the difficulty of a Sudoku grid.
+
+    Args:
+        grid(string): a string representing a sudoku grid.
+
+    Returns:
+        A dict of the rating:
+            solved: Whether the puzzle has a solution
+            strategies: The names of the strategies which were required, in
+                ladder order
+            hardest: The name of the hardest strategy required, 'search' if
+                search was needed, or None if the puzzle was already solved
+            rounds: The number of strategy calls which made progress before
+                searching
+            nodes: The search nodes expanded, 1 if propagation was enough
+            backtracks: The guesses which failed
+            score: The position of the hardest strategy required on the ladder,
+                counting from 1. If search was needed, one more than the number
+                of strategies, plus log2 of 1 + backtracks.
+            difficulty: The name of the score, see `difficulty`
+    """
+    ladder = get_ladder()
+    values = convert_grid_string_to_dict(grid)
+    history = []
+
+    required = set()
+    rounds = 0
+    score = 0
+
+    level = 0
+    while level < len(ladder) and all(values.values()):
+        new_values = ladder[level](history, values)
+
+        if new_values is values:
+            level += 1
+            continue
+
+        values = new_values
+        required.add(level)
+        rounds += 1
+        score = max(score, level + 1)
+        level = 0
+
+    board = Board.from_values(values)
+    solver = Solver(board)
+
+    solved = all(values.values())
+    if solved:
+        board.pending[:] = range(len(board.cells))
+        solved = propagate(board) and solver.run()
+        if solver.nodes > 1:
+            score = len(ladder) + 1 + log2(1 + solver.backtracks)
+
+    if solver.nodes > 1:
+        hardest = 'search'
+    elif required:
+        hardest = ladder[max(required)].__name__
+    else:
+        hardest = None
+
+    return {
+        'solved': bool(solved),
+        'strategies': [ladder[level].__name__ for level in sorted(required)],
+        'hardest': hardest,
+        'rounds': rounds,
+        'nodes': solver.nodes,
+        'backtracks': solver.backtracks,
+        'score': score,
+        'difficulty': difficulty(score, len(ladder)),
+    }
@@ -0,0 +1,51 @@
+import benchmark
+import rating
+import solution_test
+import unittest
+
+
+class TestRating(unittest.TestCase):
+    def test_propagation_only(self):
+        result = rating.rate(solution_test.TestDiagonalSudoku.diagonal_grid)
+        self.assertTrue(result['solved'])
+        self.assertEqual(result['strategies'], ['elimination', 'only_choice'])
+        self.assertEqual(result['hardest'], 'only_choice')
+        self.assertEqual(result['nodes'], 1)
+        self.assertEqual(result['difficulty'], 'medium')
+
+    def test_advanced_strategies(self):
+        # Needs a guess with only the basic strategies, but pointing pairs solve it
+        grid = '.2..8........6..3....7..9...9..3......4..2.........1...5.......918..3.74.........'
+        result = rating.rate(grid)
+        self.assertTrue(result['solved'])
+        self.assertEqual(result['hardest'], 'pointing_pairs')
+        self.assertIn('pointing_pairs', result['strategies'])
+        self.assertEqual(result['nodes'], 1)
+        self.assertEqual(result['difficulty'], 'hard')
+
+    def test_ladder(self):
+        names = [strategy.__name__ for strategy in rating.get_ladder()]
+        self.assertEqual(sorted(names[:2]), ['elimination', 'only_choice'])
+        # Disabled strategies still count for a rating
+        self.assertIn('x_wing', names)
+
+    def test_search(self):
+        result = rating.rate(benchmark.load_corpus('pathological')[0])
+        self.assertTrue(result['solved'])
+        self.assertGreater(result['nodes'], 1)
+        self.assertEqual(result['hardest'], 'search')
+        self.assertGreater(result['score'], len(rating.get_ladder()))
+        self.assertEqual(result['difficulty'], 'extreme')
+
+    def test_unsolvable(self):
+        self.assertFalse(rating.rate(benchmark.load_corpus('pathological')[-1])['solved'])
+
+    def test_corpora_order(self):
+        # The hard corpus should rate harder than the easy one on average
+        def mean_score(corpus):
+            grids = benchmark.load_corpus(corpus)
+            return sum(rating.rate(grid)['score'] for grid in grids) / len(grids)
+        self.assertLess(mean_score('easy'), mean_score('hard'))
+
+if __name__ == '__main__':
+    unittest.main()
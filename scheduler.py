@@ -0,0 +1,146 @@
+"""
+An adaptive scheduler for the constraint propagation strategies of `solution_2.reduce_puzzle`.
+
+Running every strategy every round, as `reduce_puzzle` used to, pays for the
+expensive strategies on every round even though the cheap ones do most of the
+work. The scheduler instead keeps the strategies in a ladder, cheapest first:
+
+    * It runs the first strategy until it stalls, then moves up one step.
+    * As soon as any strategy makes progress it drops back to the bottom, so the
+      cheap strategies reach a fixpoint again before anything expensive runs.
+    * The board is reduced once every strategy has stalled in a row.
+
+Each strategy declares its relative cost as a `cost` attribute, `DEFAULT_COST`
+if it doesn't, and is skipped while its `enabled` attribute is False. The
+scheduler counts the calls and successes of every strategy, and orders the
+ladder by cost per expected success before every reduce, so a strategy which
+keeps paying off climbs down and one which never does climbs up.
+
+A strategy may also declare a `tier`, `DEFAULT_TIER` if it doesn't. Lower tiers
+always come first in the ladder, whatever their cost, so the basic strategies
+reach a fixpoint before the subset and intersection ones run even once.
+
+Example:
+    scheduler = StrategyScheduler(get_plugins, lambda strategy, values: strategy(history, values))
+    values = scheduler.reduce(values)
+"""
+from time import perf_counter
+
+# The cost and tier of strategies which don't declare them
+DEFAULT_COST = 1
+DEFAULT_TIER = 1
+
+class StrategyScheduler:
+    """
+    Runs a list of strategies cheapest first, escalating only on a stall.
+
+    Strategies must return the dict they were given when they change nothing, and
+    a new one otherwise, like the strategies using `update_values` do.
+    """
+
+    def __init__(self, strategies, apply):
+        """
+        Args:
+            strategies(list): The strategies to schedule, or a function returning
+                them. Either is read again on every reduce, so the list may be
+                changed in place, and the function may return new strategies.
+            apply(function): Calls a strategy on a game state, taking params
+                (strategy, values) and returning the new game state
+        """
+        self.strategies = strategies
+        self.apply = apply
+        self.calls = {}
+        self.successes = {}
+
+    def priority(self, strategy):
+        """
+        Returns:
+            The declared cost of a strategy per expected success, lowest first.
+            Strategies which haven't run yet count as succeeding half the time.
+        """
+        calls = self.calls.get(strategy, 0)
+        successes = self.successes.get(strategy, 0)
+
+        return getattr(strategy, 'cost', DEFAULT_COST) * (calls + 2) / (successes + 1)
+
+    def rank(self, strategy):
+        """
+        Returns:
+            The sort key of a strategy in the ladder: its tier, then its priority.
+        """
+        return getattr(strategy, 'tier', DEFAULT_TIER), self.priority(strategy)
+
+    def order(self):
+        """
+        Returns:
+            The enabled strategies, in the order they will be escalated through.
+        """
+        strategies = self.strategies
+        if callable(strategies):
+            strategies = strategies()
+
+        return sorted(
+            (strategy for strategy in strategies if getattr(strategy, 'enabled', True)),
+            key=self.rank,
+        )
+
+    def reduce(self, values, profile=None):
+        """
+        Apply the strategies until all of them stall in a row.
+
+        Args:
+            values(dict): The dict storing the game state
+            profile(StrategyProfile): Optional, records statistics on every strategy call.
+                See `profiling.py`.
+
+        Returns:
+            The new game state, or False if a box was left with no possible values.
+        """
+        order = self.order()
+        calls = self.calls
+        successes = self.successes
+        apply = self.apply
+        level = 0
+
+        while level < len(order):
+            strategy = order[level]
+
+            if profile is None:
+                new_values = apply(strategy, values)
+            else:
+                start = perf_counter()
+                new_values = apply(strategy, values)
+                profile.record(strategy.__name__, perf_counter() - start, values, new_values)
+
+            calls[strategy] = calls.get(strategy, 0) + 1
+
+            if new_values is values:
+                level += 1
+                continue
+
+            successes[strategy] = successes.get(strategy, 0) + 1
+            values = new_values
+            level = 0
+
+            # Sanity check, return False if there is a box with zero available values:
+            if not all(values.values()):
+                return False
+
+        return values
+
+    def report(self):
+        """
+        Returns:
+            A list with a dict per strategy of its cost, calls and successes,
+            in the current order of the ladder.
+        """
+        return [
+            {
+                'name': strategy.__name__,
+                'cost': getattr(strategy, 'cost', DEFAULT_COST),
+                'tier': getattr(strategy, 'tier', DEFAULT_TIER),
+                'calls': self.calls.get(strategy, 0),
+                'successes': self.successes.get(strategy, 0),
+            }
+            for strategy in self.order()
+        ]
@@ -0,0 +1,95 @@
+import solution
+import solution_2
+import unittest
+from board import BOXES
+from profiling import StrategyProfile
+from scheduler import StrategyScheduler
+from strategies import get_plugins
+
+
+def make_strategy(name, cost, removes, log):
+    """
+    A strategy removing the digits in `removes` from box 'A1', one per call,
+    recording its calls in `log`.
+    """
+    def strategy(values):
+        log.append(name)
+        for digit in removes:
+            if digit in values['A1']:
+                return dict(values, A1=values['A1'].replace(digit, ''))
+        return values
+
+    strategy.__name__ = name
+    strategy.cost = cost
+    return strategy
+
+
+class TestStrategyScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.log = []
+
+    def scheduler(self, *strategies):
+        return StrategyScheduler(list(strategies), lambda strategy, values: strategy(values))
+
+    def test_escalates_only_on_a_stall(self):
+        cheap = make_strategy('cheap', 1, '1', self.log)
+        expensive = make_strategy('expensive', 10, '23', self.log)
+        values = self.scheduler(expensive, cheap).reduce({'A1': '1234'})
+
+        self.assertEqual(values, {'A1': '4'})
+        self.assertEqual(self.log, [
+            'cheap', 'cheap', 'expensive',
+            'cheap', 'expensive',
+            'cheap', 'expensive',
+        ])
+
+    def test_returns_false_on_an_empty_box(self):
+        strategy = make_strategy('strategy', 1, '12', self.log)
+        self.assertIs(self.scheduler(strategy).reduce({'A1': '12'}), False)
+
+    def test_reorders_by_success(self):
+        useless = make_strategy('useless', 1, '', self.log)
+        useful = make_strategy('useful', 2, '12345678', self.log)
+        scheduler = self.scheduler(useless, useful)
+
+        self.assertEqual([s.__name__ for s in scheduler.order()], ['useless', 'useful'])
+        scheduler.reduce({'A1': '123456789'})
+        self.assertEqual([s.__name__ for s in scheduler.order()], ['useful', 'useless'])
+
+        report = scheduler.report()
+        self.assertEqual([entry['name'] for entry in report], ['useful', 'useless'])
+        self.assertEqual(report[0]['successes'], 8)
+        self.assertEqual(report[1]['successes'], 0)
+
+    def test_tiers_come_first(self):
+        basic = make_strategy('basic', 10, '', self.log)
+        basic.tier = 0
+        cheap = make_strategy('cheap', 1, '', self.log)
+        scheduler = self.scheduler(cheap, basic)
+
+        self.assertEqual([s.__name__ for s in scheduler.order()], ['basic', 'cheap'])
+        self.assertEqual([entry['tier'] for entry in scheduler.report()], [0, 1])
+
+    def test_manifest_ladder(self):
+        # The subset and intersection strategies only run once the basic ones stall
+        names = [s.__name__ for s in StrategyScheduler(get_plugins, None).order()]
+        self.assertEqual(sorted(names[:2]), ['elimination', 'only_choice'])
+
+    def test_profile(self):
+        strategy = make_strategy('strategy', 1, '12', self.log)
+        profile = StrategyProfile()
+        self.scheduler(strategy).reduce({'A1': '123'}, profile)
+
+        self.assertEqual(profile.stats['strategy']['calls'], 3)
+        self.assertEqual(profile.stats['strategy']['eliminated'], 2)
+
+    def test_solutions_still_solve(self):
+        grid = '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+        for module in (solution, solution_2):
+            values = module.solve(grid)
+            self.assertTrue(values)
+            self.assertTrue(all(values[box] == x for box, x in zip(BOXES, grid) if x != '.'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,18 @@ constraint propagation (CP) strategies.
 
 Currently three CP strategies are implemented, but more can be added by implementing 
 a method for the strategy and adding it to the `KNOWN_STRATAGIES` list.
+
+Faster alternative engines live in their own modules, and can be selected by
+name through `solve(grid, engine=...)`. See `ENGINES`.
 """
+from importlib import import_module
+from time import perf_counter
+
+try:
+    from history import AssignmentHistory
+except ImportError:
+    # Without the history module, keep a full copy of the board per assignment
+    AssignmentHistory = list
 
 
 # ==== UTILITIES ======================================================================
@@ -271,17 +282,40 @@ KNOWN_STRATEGIES = [
 
 # ==== CORE PROGRAM ======================================================================
 
+"""
+Alternative engines which `solve` can hand a puzzle over to, by name -> module.
+Each module must provide its own `solve(grid)`. They are imported lazily, so this
+module still runs on its own.
+"""
+ENGINES = {
+    'bitmask': 'bitboard',
+    'numpy': 'vectorized',
+    'dlx': 'dlx',
+    'wide': 'wideboard',
+}
+
+# Engines which solve grids of any size, not just 9x9. The others, and the string
+# strategies in this module, raise a ValueError for larger grids.
+ENGINES_OF_ANY_SIZE = ['wide']
+
+# The engine picked by the size of the grid for `engine='auto'`, by grid length
+# -> engine name, and `AUTO_ENGINE` for any other size.
+AUTO_ENGINES = {81: 'bitmask'}
+AUTO_ENGINE = 'wide'
+
 # A history of the 'moves' made in solving the sudoku.
 # By 'move' we mean an assignment of a definite value to a box.
-assignments = []
+assignments = AssignmentHistory()
 
-def reduce_puzzle(values):
+def reduce_puzzle(values, profile=None):
     """
     Repeatedly apply every known strategy until there
     is no improvement of the board state
 
     Args:
         values(dict): The dict storing the game state
+        profile(StrategyProfile): Optional, records statistics on every strategy call.
+            See `profiling.py`.
 
     Returns:
         The new game state.
@@ -294,7 +328,13 @@ def reduce_puzzle(values):
 
         # Apply every strategy the game knows
         for strategy in KNOWN_STRATEGIES:
-            values = strategy(values, assignments)
+            if profile is None:
+                values = strategy(values, assignments)
+            else:
+                start = perf_counter()
+                new_values = strategy(values, assignments)
+                profile.record(strategy.__name__, perf_counter() - start, values, new_values)
+                values = new_values
 
         # Check how many boxes have a determined value, to compare
         solved_values_after = get_num_solved_boxes(values)
@@ -309,18 +349,19 @@ def reduce_puzzle(values):
 
     return values
 
-def search(values):
+def search(values, profile=None):
     """
     Try to solve the Sudoku by repeatedly guessing values
     and applying constraint propagation.
 
     Args:
         values(dict): The dict storing the game state
+        profile(StrategyProfile): Optional, records statistics on every strategy call.
 
     Returns:
         The new game state.
     """
-    values = reduce_puzzle(values)
+    values = reduce_puzzle(values, profile)
 
     if values is False:
         return False ## Failed earlier
@@ -339,23 +380,56 @@ def search(values):
     for value in values[s]:
         new_sudoku = values.copy()
         new_sudoku[s] = value
-        attempt = search(new_sudoku)
+        attempt = search(new_sudoku, profile)
         if attempt:
             return attempt
 
-def solve(grid):
+def can_solve(grid, engine=None):
+    """
+    Whether `solve` can solve a grid the size of `grid` with `engine`. Only the
+    engines of `ENGINES_OF_ANY_SIZE`, and 'auto', solve grids larger than 9x9.
+    """
+    return len(grid) == 81 or engine == 'auto' or engine in ENGINES_OF_ANY_SIZE
+
+def solve(grid, engine=None, profile=None, **options):
     """
     Find the solution to a Sudoku grid.
 
     Args:
         grid(string): a string representing a sudoku grid.
             Example: '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+            Grids of 256 or 625 chars, for 16x16 or 25x25, need an engine from
+            `ENGINES_OF_ANY_SIZE`, e.g. 'wide'.
+        engine(string): The name of an alternative engine from `ENGINES` to solve with,
+            e.g. 'bitmask', or 'auto' to pick one by the size of the grid, see
+            `AUTO_ENGINES`. By default the string strategies in this module are used.
+        profile(StrategyProfile): Optional, records statistics on every strategy call
+            of the default engine, so it can't be given with `engine`. See `profiling.py`.
+        options: Options for the engine, e.g. the search heuristics of the
+            bitmask engine: `solve(grid, engine='bitmask', variable='dom-wdeg')`
 
     Returns:
         The dictionary representation of the final sudoku grid. False if no solution exists.
+
+    Raises:
+        ValueError: If the grid isn't 9x9 and the engine only solves 9x9 grids,
+            or a profile is given with an engine.
     """
+    if profile is not None and engine is not None:
+        raise ValueError('profiling needs the default engine, not %r' % engine)
+
+    if not can_solve(grid, engine):
+        raise ValueError('the %s engine only solves 9x9 grids, not grids of %d chars; use one of %s' % (
+            'default' if engine is None else repr(engine), len(grid), ', '.join(map(repr, ENGINES_OF_ANY_SIZE))))
+
+    if engine == 'auto':
+        engine = AUTO_ENGINES.get(len(grid), AUTO_ENGINE)
+
+    if engine is not None:
+        return import_module(ENGINES[engine]).solve(grid, **options)
+
     values = convert_grid_string_to_dict(grid)
-    solved_game = search(values)
+    solved_game = search(values, profile)
 
     if solved_game:
         return solved_game
@@ -1,74 +1,56 @@
 import board
-from utils import get_strategies, convert_grid_string_to_dict, display
+from history import AssignmentHistory
+from scheduler import StrategyScheduler
+from strategies import get_plugins
+from utils import convert_grid_string_to_dict, display
 
 """
 This is a version of solution.py, which can't solve the AIND assignment,
 as it relies on extenral modules and a 'strategies' package. It implements 
-dynamic loading of strategies from the 'strategies' package. Any new
-constraint prop strategy added in './strategies/' will automatically be
-used in the solution.
+lazy loading of strategies from the 'strategies' package. Any new
+constraint prop strategy registered in './strategies/__init__.py' will
+automatically be used in the solution.
 """
 
 # A history of the 'moves' made in solving the sudoku.
 # By 'move' we mean an assignment of a definite value to a box.
-assignments = []
+assignments = AssignmentHistory()
 
-# A list of all strategies available in the strategies module
-KNOWN_STRATEGIES = get_strategies()
+# Runs the enabled strategies of the strategies module cheapest first, escalating
+# only when they stall. The registry is read again on every reduce, so strategies
+# registered or disabled after this module is imported are picked up. Each
+# strategy is imported on its first call.
+scheduler = StrategyScheduler(get_plugins, lambda strategy, values: strategy(assignments, values))
 
-def get_num_solved_boxes(values, num_options=0):
-    return len([
-        box 
-        for box in values.keys() 
-        if len(values[box]) == num_options
-    ])
-
-def reduce_puzzle(values):
+def reduce_puzzle(values, profile=None):
     """
-    Repeatedly apply every known strategy until there
-    is no improvement of the board state
+    Repeatedly apply the known strategies until there is no improvement of the
+    board state. They are run cheapest first, the expensive ones only once the
+    cheap ones stall. See `scheduler.py`.
 
     Args:
         values(dict): The dict storing the game state
+        profile(StrategyProfile): Optional, records statistics on every strategy call.
+            See `profiling.py`.
 
     Returns:
-        The new game state.
+        The new game state, or False if a box was left with no possible values.
     """
-    has_stalled = False
-
-    while not has_stalled:
-        # Check how many boxes have a determined value
-        solved_values_before = get_num_solved_boxes(values)
-
-        # Apply every strategy the game knows
-        for strategy in KNOWN_STRATEGIES:
-            values = strategy(assignments, values)
-
-        # Check how many boxes have a determined value, to compare
-        solved_values_after = get_num_solved_boxes(values)
-
-        # If no new values were added, stop the loop.
-        has_stalled = solved_values_before == solved_values_after
-
-        # Sanity check, return False if there is a box with zero available values:
-        num_unsolvable_boxes = get_num_solved_boxes(values, 0)
-        if num_unsolvable_boxes:
-            return False
-
-    return values
+    return scheduler.reduce(values, profile)
 
-def search(values):
+def search(values, profile=None):
     """
     Try to solve the Sudoku by repeatedly guessing values
     and applying constraint propagation.
 
     Args:
         values(dict): The dict storing the game state
+        profile(StrategyProfile): Optional, records statistics on every strategy call.
 
     Returns:
         The new game state.
     """
-    values = reduce_puzzle(values)
+    values = reduce_puzzle(values, profile)
 
     if values is False:
         return False ## Failed earlier
@@ -87,23 +69,25 @@ def search(values):
     for value in values[s]:
         new_sudoku = values.copy()
         new_sudoku[s] = value
-        attempt = search(new_sudoku)
+        attempt = search(new_sudoku, profile)
         if attempt:
             return attempt
 
-def solve(grid):
+def solve(grid, profile=None):
     """
     Find the solution to a Sudoku grid.
 
     Args:
         grid(string): a string representing a sudoku grid.
             Example: '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+        profile(StrategyProfile): Optional, records statistics on every strategy call.
+            See `profiling.py`.
 
     Returns:
         The dictionary representation of the final sudoku grid. False if no solution exists.
     """
     values = convert_grid_string_to_dict(grid)
-    solved_game = search(values)
+    solved_game = search(values, profile)
 
     return solved_game
 
@@ -0,0 +1,113 @@
+"""
+The registry of constraint propagation strategies for `solution_2.py`.
+
+Every strategy is registered by name in the manifest at the bottom of this
+module, with its metadata: the relative cost of a call and its tier, used by
+`scheduler.py` to run the basic strategies first and then the cheapest, and
+whether it is enabled. Nothing is scanned, so
+finding the strategies doesn't touch the filesystem or depend on the current
+directory, and a strategy's module is only imported the first time it is called.
+
+Strategies from outside this package can be registered too:
+
+    register('swordfish', module='my_strategies.swordfish', cost=4)
+"""
+from importlib import import_module
+
+# The cost and tier of strategies which don't declare them
+DEFAULT_COST = 1
+DEFAULT_TIER = 1
+
+class Plugin:
+    """
+    A registered strategy, called like the strategy itself with params
+    `history(list), values(dict)`. The module is imported on the first call.
+    """
+
+    def __init__(self, name, module, function=None, cost=DEFAULT_COST, tier=DEFAULT_TIER, enabled=True):
+        """
+        Args:
+            name(string): The name of the strategy, e.g. 'naked_twins'
+            module(string): The module to import the strategy from
+            function(string): The name of the strategy in `module`, by default `name`
+            cost(number): The relative cost of a call, roughly its time on a typical board
+            tier(int): Strategies of lower tiers are run first, whatever their cost
+            enabled(bool): Whether `solution_2.py` should run the strategy
+        """
+        self.__name__ = name
+        self.module = module
+        self.function = function or name
+        self.cost = cost
+        self.tier = tier
+        self.enabled = enabled
+        self.strategy = None
+
+    def load(self):
+        """
+        Returns:
+            The strategy function, importing its module if it hasn't been yet.
+        """
+        if self.strategy is None:
+            self.strategy = getattr(import_module(self.module), self.function)
+        return self.strategy
+
+    def __call__(self, history, values):
+        strategy = self.strategy
+        if strategy is None:
+            strategy = self.load()
+        return strategy(history, values)
+
+    def __repr__(self):
+        return '<Plugin %s cost=%s%s>' % (self.__name__, self.cost, '' if self.enabled else ' disabled')
+
+# The registered strategies, by name -> Plugin, in the order they were registered
+REGISTRY = {}
+
+def register(name, module=None, function=None, cost=DEFAULT_COST, tier=DEFAULT_TIER, enabled=True):
+    """
+    Register a strategy, replacing any registered under the same name.
+
+    Args:
+        name(string): The name of the strategy
+        module(string): The module to import it from, by default the module of
+            the same name in this package
+
+    See `Plugin` for the other args.
+
+    Returns:
+        The new Plugin.
+    """
+    plugin = REGISTRY[name] = Plugin(name, module or __name__ + '.' + name, function, cost, tier, enabled)
+    return plugin
+
+def get_plugins(enabled=True):
+    """
+    Args:
+        enabled(bool): Only return the enabled strategies. If False, return all of them.
+
+    Returns:
+        A list of the registered strategies, in the order they were registered.
+    """
+    return [
+        plugin
+        for plugin in REGISTRY.values()
+        if plugin.enabled or not enabled
+    ]
+
+
+# ==== MANIFEST ======================================================================
+
+# Costs are the time of a call on boards met while solving the hard corpus,
+# in units of roughly 75 microseconds. elimination and only_choice make most of
+# the progress, so they are tier 0: the others only run once both stall.
+# hidden_subsets and x_wing cost more time than they save in search, and
+# naked_subsets finds every naked pair naked_twins does, so those three are
+# disabled by default.
+register('box_line_reduction', cost=1)
+register('elimination', cost=3, tier=0)
+register('hidden_subsets', cost=2, enabled=False)
+register('naked_subsets', cost=3)
+register('naked_twins', cost=1, enabled=False)
+register('only_choice', cost=5, tier=0)
+register('pointing_pairs', cost=1)
+register('x_wing', cost=2, enabled=False)
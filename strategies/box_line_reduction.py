@@ -0,0 +1,49 @@
+from bitboard import Board, DIGITS_OF
+from board import BOXES, SQUARE_UNITS, ROW_UNITS, COLUMN_UNITS, DIAGONAL_UNITS, INDEX_OF, update_values
+
+# For every row, column or diagonal and square it crosses in more than one box:
+# the indices of the line's other boxes, of the shared boxes, and of the
+# square's other boxes
+INTERSECTIONS = [
+    (
+        tuple(INDEX_OF[box] for box in line if box not in square),
+        tuple(INDEX_OF[box] for box in line if box in square),
+        tuple(INDEX_OF[box] for box in square if box not in line),
+    )
+    for line in ROW_UNITS + COLUMN_UNITS + DIAGONAL_UNITS
+    for square in SQUARE_UNITS
+    if len(set(square) & set(line)) > 1
+]
+
+def box_line_reduction(history, values):
+    """
+    Eliminate values using box/line reduction: when a digit of a row, column or
+    diagonal can only go in the boxes it shares with a square, it must go there,
+    so can't go in the rest of that square.
+
+    Args:
+        history(list): A list of dicts, representing the game state for sequential moves
+        values(dict): a dictionary of the form {'box_name': '123456789', ...}
+
+    Returns:
+        The values dictionary with the claimed digits eliminated from their squares.
+    """
+    masks = Board.from_values(values).cells
+
+    for rest, shared, others in INTERSECTIONS:
+        outside = 0
+        for i in rest:
+            outside |= masks[i]
+        inside = 0
+        for i in shared:
+            inside |= masks[i]
+
+        # Digits of the line which only fit in the shared boxes
+        claimed = inside & ~outside
+        if claimed:
+            for i in others:
+                if masks[i] & claimed:
+                    masks[i] &= ~claimed
+                    values = update_values(history, values, BOXES[i], DIGITS_OF[masks[i]])
+
+    return values
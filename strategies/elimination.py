@@ -20,4 +20,4 @@ def elimination(history, values):
             new_value = values[peer].replace(digit, '')
             values = update_values(history, values, peer, new_value)
 
-    return values
\ No newline at end of file
+    return values
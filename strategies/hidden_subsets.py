@@ -0,0 +1,57 @@
+from bitboard import Board, DIGITS_OF, POPCOUNT, find_naked_subsets, places_of
+from board import BOXES, UNIT_INDICES, update_values
+from strategies import REGISTRY
+
+# Units with fewer unfilled boxes are skipped while naked_subsets is enabled. A
+# hidden subset of n digits among u unfilled boxes leaves a naked subset of the
+# other u - n boxes, which naked_subsets finds for up to 4 boxes, so hidden pairs
+# and triples only add anything in units with at least 7 unfilled boxes.
+MIN_UNFILLED = 7
+
+# Units with fewer unfilled boxes are skipped otherwise: a hidden triple among
+# 3 boxes, or pair among 2, has nothing else to eliminate.
+MIN_UNFILLED_ALONE = 3
+
+def min_unfilled():
+    """
+    Returns:
+        The fewest unfilled boxes a unit needs to be searched, depending on
+        whether naked_subsets is registered and enabled.
+    """
+    naked_subsets = REGISTRY.get('naked_subsets')
+    if naked_subsets is not None and naked_subsets.enabled:
+        return MIN_UNFILLED
+    return MIN_UNFILLED_ALONE
+
+def hidden_subsets(history, values):
+    """
+    Eliminate values using hidden pairs and triples: n digits of a unit which
+    can only go in the same n boxes, so those boxes can't hold any other digit.
+
+    A hidden subset is a naked subset with boxes and digits swapped, so each
+    unit is turned into one mask of possible positions per digit and searched
+    with `find_naked_subsets`.
+
+    Args:
+        history(list): A list of dicts, representing the game state for sequential moves
+        values(dict): a dictionary of the form {'box_name': '123456789', ...}
+
+    Returns:
+        The values dictionary with the other digits eliminated from hidden subsets.
+    """
+    masks = Board.from_values(values).cells
+    fewest = min_unfilled()
+
+    for unit in UNIT_INDICES:
+        unit_masks = [masks[i] for i in unit]
+        if sum(1 for mask in unit_masks if POPCOUNT[mask] > 1) < fewest:
+            continue
+
+        for positions, digits in find_naked_subsets(places_of(unit_masks), max_size=3):
+            keep = sum(1 << d for d in digits)
+            for p, i in enumerate(unit):
+                if positions >> p & 1 and masks[i] & ~keep:
+                    masks[i] &= keep
+                    values = update_values(history, values, BOXES[i], DIGITS_OF[masks[i]])
+
+    return values
@@ -0,0 +1,29 @@
+from bitboard import Board, DIGITS_OF, find_naked_subsets
+from board import BOXES, UNIT_INDICES, update_values
+
+def naked_subsets(history, values):
+    """
+    Eliminate values using naked pairs, triples and quads: n boxes of a unit
+    holding only n digits between them, which can then be ruled out of the rest
+    of the unit.
+
+    Each unit is searched in one pass over the candidate bitmasks of its boxes.
+
+    Args:
+        history(list): A list of dicts, representing the game state for sequential moves
+        values(dict): a dictionary of the form {'box_name': '123456789', ...}
+
+    Returns:
+        The values dictionary with the naked subsets eliminated from their units.
+    """
+    masks = Board.from_values(values).cells
+
+    for unit in UNIT_INDICES:
+        for subset, members in find_naked_subsets([masks[i] for i in unit]):
+            for p, i in enumerate(unit):
+                mask = masks[i]
+                if mask & subset and p not in members:
+                    masks[i] = mask & ~subset
+                    values = update_values(history, values, BOXES[i], DIGITS_OF[masks[i]])
+
+    return values
@@ -45,4 +45,4 @@ def naked_twins(history, values):
                         new_value = values[box].replace(digit, '')
                         values = update_values(history, values, box, new_value)
 
-    return values
\ No newline at end of file
+    return values
@@ -24,4 +24,4 @@ def only_choice(history, values):
             if len(dplaces) == 1:
                 values = update_values(history, values, dplaces[0], digit)
 
-    return values
\ No newline at end of file
+    return values
@@ -0,0 +1,49 @@
+from bitboard import Board, DIGITS_OF
+from board import BOXES, SQUARE_UNITS, ROW_UNITS, COLUMN_UNITS, DIAGONAL_UNITS, INDEX_OF, update_values
+
+# For every square and line (row, column or diagonal) crossing it in more than
+# one box: the indices of the square's other boxes, of the shared boxes, and of
+# the line's other boxes
+INTERSECTIONS = [
+    (
+        tuple(INDEX_OF[box] for box in square if box not in line),
+        tuple(INDEX_OF[box] for box in square if box in line),
+        tuple(INDEX_OF[box] for box in line if box not in square),
+    )
+    for square in SQUARE_UNITS
+    for line in ROW_UNITS + COLUMN_UNITS + DIAGONAL_UNITS
+    if len(set(square) & set(line)) > 1
+]
+
+def pointing_pairs(history, values):
+    """
+    Eliminate values using pointing pairs and triples: when a digit of a square
+    can only go in the boxes it shares with a row, column or diagonal, it must
+    go there, so can't go in the rest of that line.
+
+    Args:
+        history(list): A list of dicts, representing the game state for sequential moves
+        values(dict): a dictionary of the form {'box_name': '123456789', ...}
+
+    Returns:
+        The values dictionary with the pointing digits eliminated from their lines.
+    """
+    masks = Board.from_values(values).cells
+
+    for rest, shared, others in INTERSECTIONS:
+        outside = 0
+        for i in rest:
+            outside |= masks[i]
+        inside = 0
+        for i in shared:
+            inside |= masks[i]
+
+        # Digits of the square which only fit in the shared boxes
+        pointing = inside & ~outside
+        if pointing:
+            for i in others:
+                if masks[i] & pointing:
+                    masks[i] &= ~pointing
+                    values = update_values(history, values, BOXES[i], DIGITS_OF[masks[i]])
+
+    return values
@@ -0,0 +1,47 @@
+from bitboard import Board, DIGITS_OF, POPCOUNT, places_of
+from board import BOXES, UNIT_INDICES, update_values
+
+ROWS = UNIT_INDICES[:9]
+COLUMNS = UNIT_INDICES[9:18]
+
+def x_wing(history, values):
+    """
+    Eliminate values using the X-Wing strategy: when a digit can only go in the
+    same two columns in each of two rows, it goes in one corner of that rectangle
+    in each row, and so in each of the two columns. It can't go anywhere else in
+    those columns. The same holds with rows and columns swapped.
+
+    Args:
+        history(list): A list of dicts, representing the game state for sequential moves
+        values(dict): a dictionary of the form {'box_name': '123456789', ...}
+
+    Returns:
+        The values dictionary with the X-Wing digits eliminated.
+    """
+    masks = Board.from_values(values).cells
+
+    for lines, crossing in ((ROWS, COLUMNS), (COLUMNS, ROWS)):
+        # For each digit, the lines where it has exactly two places, by those places
+        pairs = [{} for d in range(9)]
+
+        for k, line in enumerate(lines):
+            for d, places in enumerate(places_of([masks[i] for i in line])):
+                if POPCOUNT[places] != 2:
+                    continue
+
+                if places not in pairs[d]:
+                    pairs[d][places] = k
+                    continue
+
+                # An X-Wing: clear the digit from the two crossing lines,
+                # except in these two lines
+                bit = 1 << d
+                wing = (pairs[d][places], k)
+                for p in range(9):
+                    if places >> p & 1:
+                        for m, i in enumerate(crossing[p]):
+                            if m not in wing and masks[i] & bit:
+                                masks[i] &= ~bit
+                                values = update_values(history, values, BOXES[i], DIGITS_OF[masks[i]])
+
+    return values
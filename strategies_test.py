@@ -0,0 +1,171 @@
+import pkgutil
+import solution_2
+import solution_test
+import strategies
+import sys
+import unittest
+
+from board import BOXES
+from scheduler import StrategyScheduler
+from strategies.box_line_reduction import box_line_reduction
+from strategies.hidden_subsets import hidden_subsets
+from strategies.naked_subsets import naked_subsets
+from strategies.pointing_pairs import pointing_pairs
+from strategies.x_wing import x_wing
+from utils import get_strategies
+
+
+class TestNakedSubsets(unittest.TestCase):
+    def test_discovered(self):
+        self.assertIn(naked_subsets, get_strategies())
+
+    def test_naked_twins(self):
+        # Pairs are naked subsets too, so at least the naked twins get eliminated
+        for before, possible in (
+            (solution_test.TestNakedTwins.before_naked_twins_1, solution_test.TestNakedTwins.possible_solutions_1),
+            (solution_test.TestNakedTwins.before_naked_twins_2, solution_test.TestNakedTwins.possible_solutions_2),
+        ):
+            after = naked_subsets([], dict(before))
+            self.assertTrue(any(
+                all(after[box] and set(after[box]) <= set(solution[box]) for box in BOXES)
+                for solution in possible
+            ))
+
+    def test_naked_triple(self):
+        # A1, A2 and A3 hold only 1, 2 and 3 between them
+        values = dict((box, '123456789') for box in BOXES)
+        values.update({'A1': '12', 'A2': '23', 'A3': '13'})
+        after = naked_subsets([], values)
+        for box in ('A4', 'A5', 'A6', 'A7', 'A8', 'A9'):
+            self.assertEqual(after[box], '456789')
+        # The triple is in square 1 as well
+        for box in ('B1', 'B2', 'B3', 'C1', 'C2', 'C3'):
+            self.assertEqual(after[box], '456789')
+        self.assertEqual(after['D1'], '123456789')
+
+    def test_naked_quad(self):
+        values = dict((box, '123456789') for box in BOXES)
+        values.update({'A1': '12', 'B1': '34', 'D1': '1234', 'G1': '14'})
+        after = naked_subsets([], values)
+        self.assertEqual(after['E1'], '56789')
+        self.assertEqual(after['A1'], '12')
+        self.assertEqual(after['A2'], '123456789')
+
+def empty_board(**boxes):
+    """
+    A board with every digit possible in every box, except for `boxes`.
+    """
+    values = dict((box, '123456789') for box in BOXES)
+    values.update(boxes)
+    return values
+
+def without_1(*boxes):
+    return dict((box, '23456789') for box in boxes)
+
+
+class TestHiddenSubsets(unittest.TestCase):
+    def test_hidden_pair(self):
+        # 1 and 2 can only go in A1 and A2 of row A
+        values = empty_board(**dict((box, '3456789') for box in ('A3', 'A4', 'A5', 'A6', 'A7', 'A8', 'A9')))
+        after = hidden_subsets([], values)
+        self.assertEqual(after['A1'], '12')
+        self.assertEqual(after['A2'], '12')
+        self.assertEqual(after['B1'], '123456789')
+
+    def test_small_units_without_naked_subsets(self):
+        # Only 4 boxes of row A are unfilled, and 1 and 2 can only go in A6 and A7.
+        # naked_subsets finds the pair A8, A9 instead, unless it is disabled.
+        row = dict(A1='5', A2='6', A3='7', A4='8', A5='9', A6='1234', A7='1234', A8='34', A9='34')
+        self.assertEqual(hidden_subsets([], empty_board(**row))['A6'], '1234')
+
+        naked_subsets = strategies.REGISTRY['naked_subsets']
+        try:
+            strategies.register('naked_subsets', enabled=False)
+            after = hidden_subsets([], empty_board(**row))
+        finally:
+            strategies.REGISTRY['naked_subsets'] = naked_subsets
+        self.assertEqual(after['A6'], '12')
+        self.assertEqual(after['A7'], '12')
+
+
+class TestIntersections(unittest.TestCase):
+    def test_pointing_pair(self):
+        # In the top left square, 1 can only go in A1 or A2, so not elsewhere in row A
+        values = empty_board(**without_1('A3', 'B1', 'B2', 'B3', 'C1', 'C2', 'C3'))
+        after = pointing_pairs([], values)
+        self.assertEqual([after['A%d' % c] for c in range(4, 10)], ['23456789'] * 6)
+        self.assertEqual(after['D1'], '123456789')
+
+    def test_box_line_reduction(self):
+        # In row A, 1 can only go in the top left square, so not elsewhere in that square
+        values = empty_board(**without_1('A4', 'A5', 'A6', 'A7', 'A8', 'A9'))
+        after = box_line_reduction([], values)
+        self.assertEqual([after[box] for box in ('B1', 'B2', 'B3', 'C1', 'C2', 'C3')], ['23456789'] * 6)
+        self.assertEqual(after['A1'], '123456789')
+        self.assertEqual(after['D1'], '123456789')
+
+    def test_diagonal(self):
+        # On the main diagonal, 1 can only go in the top left square
+        values = empty_board(**without_1('D4', 'E5', 'F6', 'G7', 'H8', 'I9'))
+        after = box_line_reduction([], values)
+        self.assertEqual([after[box] for box in ('A2', 'A3', 'B1', 'B3', 'C1', 'C2')], ['23456789'] * 6)
+        self.assertEqual(after['B2'], '123456789')
+
+
+class TestXWing(unittest.TestCase):
+    def test_x_wing(self):
+        # In rows A and E, 1 can only go in columns 1 and 5
+        values = empty_board(**without_1('A2', 'A3', 'A4', 'A6', 'A7', 'A8', 'A9',
+                                         'E2', 'E3', 'E4', 'E6', 'E7', 'E8', 'E9'))
+        after = x_wing([], values)
+        for row in 'BCDFGHI':
+            self.assertEqual(after[row + '1'], '23456789')
+            self.assertEqual(after[row + '5'], '23456789')
+            self.assertEqual(after[row + '2'], '123456789')
+        self.assertEqual(after['A1'], '123456789')
+
+class TestRegistry(unittest.TestCase):
+    def tearDown(self):
+        strategies.REGISTRY.pop('test_strategy', None)
+
+    def test_manifest_lists_every_module(self):
+        modules = [name for _, name, _ in pkgutil.iter_modules(strategies.__path__)]
+        self.assertEqual(sorted(strategies.REGISTRY), sorted(modules))
+
+    def test_lazy_loading(self):
+        sys.modules.pop('strategies.x_wing', None)
+        plugin = strategies.register('test_strategy', module='strategies.x_wing', function='x_wing', cost=2)
+        self.assertNotIn('strategies.x_wing', sys.modules)
+
+        values = empty_board()
+        self.assertIs(plugin([], values), values)
+        self.assertIn('strategies.x_wing', sys.modules)
+        self.assertIs(plugin.load(), sys.modules['strategies.x_wing'].x_wing)
+
+    def test_disabled(self):
+        plugin = strategies.register('test_strategy', module='strategies.x_wing', function='x_wing', enabled=False)
+        self.assertIn(plugin, strategies.get_plugins(enabled=False))
+        self.assertNotIn(plugin, strategies.get_plugins())
+        self.assertNotIn(plugin, StrategyScheduler([plugin], None).order())
+
+    def test_registered_after_import(self):
+        plugin = strategies.register('test_strategy', module='strategies.x_wing', function='x_wing')
+        self.assertIn(plugin, solution_2.scheduler.order())
+
+        # Registering again replaces the strategy, here with a disabled one
+        disabled = strategies.register('test_strategy', module='strategies.x_wing', function='x_wing', enabled=False)
+        order = solution_2.scheduler.order()
+        self.assertNotIn(plugin, order)
+        self.assertNotIn(disabled, order)
+
+    def test_disabled_after_import(self):
+        elimination = strategies.REGISTRY['elimination']
+        try:
+            strategies.register('elimination', enabled=False)
+            names = [strategy.__name__ for strategy in solution_2.scheduler.order()]
+            self.assertNotIn('elimination', names)
+        finally:
+            strategies.REGISTRY['elimination'] = elimination
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+This module canonicalizes Diagonal Sudoku grids, so that equivalent puzzles can
+be recognised, deduplicated and cached.
+
+Two grids are equivalent if one can be turned into the other by relabelling its
+digits and by a symmetry of the board which keeps every unit a unit. Unlike for
+plain sudoku, this must keep both diagonals as units, so only these symmetries
+of the board are used:
+
+    * the 8 rotations and reflections of the square, e.g. transpose,
+      anti-transpose and 180 degree rotation. Some of them swap the two
+      diagonals, which is fine as both are units.
+    * permutations applied to the rows and the columns alike, which move rows
+      within and between bands while keeping the diagonals in place: swapping
+      the top and bottom bands, permuting the rows of the top band while
+      mirroring that in the bottom band, and swapping the outer rows of the
+      middle band.
+
+Together they make 96 distinct permutations of the boxes.
+"""
+from itertools import permutations
+from operator import itemgetter
+
+DIGITS = '123456789'
+
+def row_permutations():
+    """
+    Returns:
+        Every permutation of the 9 row indices which keeps bands as bands and,
+        when applied to rows and columns alike, keeps both diagonals in place.
+        Those are the ones commuting with reversal, i -> 8 - i.
+    """
+    result = []
+
+    for top in permutations(range(3)):
+        for middle in ((3, 4, 5), (5, 4, 3)):
+            # The bottom band mirrors the top one
+            rows = list(top) + list(middle) + [8 - i for i in reversed(top)]
+            result.append(rows)
+            # Swap the top and bottom bands
+            result.append(rows[6:] + rows[3:6] + rows[:3])
+
+    return result
+
+# The rotations and reflections of the square, as functions of (row, column)
+SQUARE_SYMMETRIES = [
+    lambda r, c: (r, c),
+    lambda r, c: (c, r),
+    lambda r, c: (8 - c, 8 - r),
+    lambda r, c: (8 - r, 8 - c),
+    lambda r, c: (r, 8 - c),
+    lambda r, c: (8 - r, c),
+    lambda r, c: (c, 8 - r),
+    lambda r, c: (8 - c, r),
+]
+
+def board_permutations():
+    """
+    Returns:
+        A sorted list of every distinct diagonal-preserving permutation of the 81
+        boxes, each a tuple where box `i` of the transformed grid is box
+        `permutation[i]` of the original.
+    """
+    result = set()
+
+    for rows in row_permutations():
+        for symmetry in SQUARE_SYMMETRIES:
+            result.add(tuple(
+                9 * rows[r2] + rows[c2]
+                for r in range(9)
+                for c in range(9)
+                for r2, c2 in [symmetry(r, c)]
+            ))
+
+    return sorted(result)
+
+PERMUTATIONS = board_permutations()
+
+# For each permutation, its inverse
+INVERSE_PERMUTATIONS = [
+    tuple(sorted(range(81), key=permutation.__getitem__))
+    for permutation in PERMUTATIONS
+]
+
+# Picking boxes through itemgetter is much faster than indexing them one by one
+PERMUTE = [itemgetter(*permutation) for permutation in PERMUTATIONS]
+INVERSE_PERMUTE = [itemgetter(*permutation) for permutation in INVERSE_PERMUTATIONS]
+
+def relabel(grid):
+    """
+    Relabel the digits of a grid in order of their first appearance.
+
+    Returns:
+        The relabelled grid string, and the digits in the order they were
+        relabelled '1' to '9', e.g. '231456789'.
+    """
+    # dict.fromkeys keeps the digits in order of first appearance
+    order = ''.join(dict.fromkeys(grid.replace('.', '')))
+    if len(order) < 9:
+        # Digits missing from the grid take the remaining labels in order
+        order += ''.join(x for x in DIGITS if x not in order)
+
+    return grid.translate(str.maketrans(order, DIGITS)), order
+
+def canonicalize(grid):
+    """
+    Find the canonical form of a grid: the smallest grid string among every
+    equivalent grid, under the diagonal-preserving symmetries and relabelling.
+
+    Args:
+        grid(string): a string representing a sudoku grid
+
+    Returns:
+        The canonical grid string, and the transform which produced it, as a
+        (permutation index, labels) pair where labels is the string of the
+        labels given to the digits 1-9, e.g. '312456789'. See `apply` and `invert`.
+    """
+    grids = [''.join(permute(grid)) for permute in PERMUTE]
+
+    # Relabelling keeps empties where they are, and '.' sorts before any digit,
+    # so only the grids with the longest run of leading empties can be smallest.
+    leading = [81 - len(x.lstrip('.')) for x in grids]
+    most = max(leading)
+
+    best = None
+    for k, x in enumerate(grids):
+        if leading[k] == most:
+            candidate, order = relabel(x)
+            if best is None or candidate < best:
+                best, best_k, best_order = candidate, k, order
+
+    labels = DIGITS.translate(str.maketrans(best_order, DIGITS))
+    return best, (best_k, labels)
+
+def apply(grid, transform):
+    """
+    Transform a grid, e.g. a solution, in the same way as `canonicalize` did.
+
+    Args:
+        grid(string): a grid string
+        transform: A transform returned by `canonicalize`
+
+    Returns:
+        The transformed grid string.
+    """
+    k, labels = transform
+    return ''.join(PERMUTE[k](grid)).translate(str.maketrans(DIGITS, labels))
+
+def invert(grid, transform):
+    """
+    Map a grid in canonical form back through the inverse of `transform`.
+
+    Args:
+        grid(string): a grid string in canonical form, e.g. the solution of a
+            canonical puzzle
+        transform: The transform returned by `canonicalize`
+
+    Returns:
+        The grid string in the original orientation and labelling.
+    """
+    k, labels = transform
+    return ''.join(INVERSE_PERMUTE[k](grid.translate(str.maketrans(labels, DIGITS))))
@@ -0,0 +1,38 @@
+import random
+import solution_test
+import symmetry
+import unittest
+from board import ALL_UNITS, INDEX_OF
+from utils import convert_dict_to_grid_string
+
+
+class TestSymmetry(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    solved_diag_grid = convert_dict_to_grid_string(solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+
+    def test_permutations_keep_units(self):
+        units = set(frozenset(INDEX_OF[box] for box in unit) for unit in ALL_UNITS)
+        self.assertEqual(len(symmetry.PERMUTATIONS), 96)
+        for permutation in symmetry.PERMUTATIONS:
+            self.assertEqual(set(frozenset(permutation[i] for i in unit) for unit in units), units)
+
+    def test_equivalent_grids(self):
+        canonical, transform = symmetry.canonicalize(self.diagonal_grid)
+        rng = random.Random(0)
+        for _ in range(10):
+            permutation = rng.choice(symmetry.PERMUTATIONS)
+            labels = ''.join(rng.sample(symmetry.DIGITS, 9))
+            grid = ''.join(self.diagonal_grid[i] for i in permutation)
+            grid = grid.translate(str.maketrans(symmetry.DIGITS, labels))
+            self.assertEqual(symmetry.canonicalize(grid)[0], canonical)
+
+    def test_invert(self):
+        canonical, transform = symmetry.canonicalize(self.diagonal_grid)
+        self.assertEqual(symmetry.apply(self.diagonal_grid, transform), canonical)
+        self.assertEqual(symmetry.invert(canonical, transform), self.diagonal_grid)
+        # A solution maps back the same way
+        solved = symmetry.apply(self.solved_diag_grid, transform)
+        self.assertEqual(symmetry.invert(solved, transform), self.solved_diag_grid)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,28 +1,20 @@
-import pkgutil
-from board import ROWS, COLS, BOXES
+from board import BOXES, geometry_of
+from strategies import get_plugins
 
 def get_strategies():
     """
-    Gets a list of all available strategies
+    Gets a list of all enabled strategies, importing them. `solution_2.py` uses
+    the registry in `strategies` directly, which imports each one on first use.
 
     Returns:
         A list of methods, each representing a strategy from the strategies module
     """
-    strategy_names = [name for _, name, _ in pkgutil.iter_modules(['strategies'])]
-
-    strategy_methods = []
-
-    for strategy in strategy_names:
-        module_name = "strategies." + strategy
-        module = __import__(module_name, fromlist=[''])
-        method = getattr(module, strategy)
-        strategy_methods.append(method)
-
-    return strategy_methods
+    return [plugin.load() for plugin in get_plugins()]
 
 def convert_grid_string_to_dict(grid):
     """
     Convert grid into a dict of {square: char} with '123456789' for empties.
+    Larger grids, e.g. 256 chars for 16x16, get the boxes and digits of their size.
 
     Args:
         grid(string) - A grid in string form.
@@ -32,25 +24,43 @@ def convert_grid_string_to_dict(grid):
             Keys: The boxes, e.g., 'A1'
             Values: The value in each box, e.g., '8'. If the box has no value, then the value will be '123456789'.
     """
-    assert len(grid) == 81, "Input grid must be a string of length 81 (9x9)"
-
-    grid_list = [x if x != '.' else '123456789' for x in grid]
+    if len(grid) == 81:
+        return dict(zip(BOXES, [x if x != '.' else '123456789' for x in grid]))
 
-    return dict(zip(BOXES, grid_list))
+    return geometry_of(grid).grid_to_values(grid)
 
 def display(values):
     """
-    Display the values as a 2-D grid.
+    Display the values as a 2-D grid, of any size.
     
     Args:
         values(dict): The sudoku in dictionary form
     """
-    width = 1 + max(len(values[s]) for s in BOXES)
-    line = '  | ' + '+'.join(['-' * (width * 3)] * 3)
-    print('    ' + ''.join(col.center(width) + ('|' if col in '36' else '') for col in COLS))
+    geometry = geometry_of(values)
+    n = geometry.BOX_SIZE
+
+    # The columns and rows followed by a bar, at the end of every square but the last
+    bars = set(range(n - 1, geometry.SIZE - 1, n))
+
+    width = 1 + max(max(len(values[s]) for s in geometry.BOXES), len(geometry.COLS[-1]))
+    line = '  | ' + '+'.join(['-' * (width * n)] * n)
+    print('    ' + ''.join(col.center(width) + ('|' if c in bars else '') for c, col in enumerate(geometry.COLS)))
     print(line)
-    for row in ROWS:
-        print(row + ' | ' + ''.join(values[row + col].center(width) + ('|' if col in '36' else '') for col in COLS))
-        if row in 'CF':
+    for r, row in enumerate(geometry.ROWS):
+        print(row + ' | ' + ''.join(values[row + col].center(width) + ('|' if c in bars else '') for c, col in enumerate(geometry.COLS)))
+        if r in bars:
             print(line)
-    return
\ No newline at end of file
+    return
+
+def convert_dict_to_grid_string(values):
+    """
+    Convert a grid in dictionary form back into a string, with '.' for any box
+    which isn't solved. 81 chars for 9x9, `len(values)` for any size.
+
+    Args:
+        values(dict): The sudoku in dictionary form
+
+    Returns:
+        A grid in string form.
+    """
+    return geometry_of(values).values_to_grid(values)
@@ -0,0 +1,258 @@
+"""
+A batch engine which runs constraint propagation on thousands of Diagonal Sudoku
+puzzles at once with NumPy.
+
+The batch is held as an (N, 81) array of 9-bit candidate masks, laid out like
+the masks of `bitboard.Board`. Elimination, only-choice and naked twins are each
+applied to every puzzle in the batch with a handful of array operations, over
+peer and unit index arrays built from the tables in `board.py`. Most puzzles are
+solved by propagation alone; those that stall are handed over to the scalar
+`bitboard.search` for branching.
+
+This module requires NumPy.
+"""
+import numpy as np
+
+import bitboard
+from board import BOXES, UNIT_INDICES, PEER_INDICES
+from bitboard import UNIT_IDS_OF
+
+
+# ==== TABLES ======================================================================
+
+ALL_DIGITS = bitboard.ALL_DIGITS
+
+# Indexed by mask, like the tables in `bitboard`
+POPCOUNT = np.array(bitboard.POPCOUNT, dtype=np.uint8)
+
+# The character of a mask in a grid string: its digit if solved, '.' otherwise
+CHAR_OF = np.array(
+    [ord(bitboard.DIGITS_OF[mask]) if bitboard.POPCOUNT[mask] == 1 else ord('.')
+     for mask in range(ALL_DIGITS + 1)],
+    dtype=np.uint8,
+)
+
+# Indexed by character code, the mask of each grid string character
+MASK_OF_CHAR = np.zeros(256, dtype=np.uint16)
+MASK_OF_CHAR[ord('.')] = ALL_DIGITS
+for digit, bit in bitboard.BIT_OF.items():
+    MASK_OF_CHAR[ord(digit)] = bit
+
+# (81, 32): the peers of each box. Boxes on the diagonals have more peers than
+# the others, so the rest is padded with box index 81, which always holds 0.
+PEERS = np.full((len(BOXES), max(len(peers) for peers in PEER_INDICES)), len(BOXES), dtype=np.intp)
+for i, peers in enumerate(PEER_INDICES):
+    PEERS[i, :len(peers)] = peers
+
+# (29, 9): the boxes of each unit
+UNITS = np.array(UNIT_INDICES, dtype=np.intp)
+
+# (81, 5): for each box, its positions in the flattened (29 * 9) unit array.
+# Boxes belong to 3, 4 or 5 units, so the rest is padded likewise with the
+# position one past the end.
+PADDING = UNITS.size
+UNIT_POSITIONS = np.full((len(BOXES), max(len(ids) for ids in UNIT_IDS_OF)), PADDING, dtype=np.intp)
+for k, unit in enumerate(UNIT_INDICES):
+    for position, i in enumerate(unit):
+        row = UNIT_POSITIONS[i]
+        row[np.argmax(row == PADDING)] = k * len(unit) + position
+
+
+# ==== CONVERSION ======================================================================
+
+def grids_to_masks(grids):
+    """
+    Convert grid strings into an (N, 81) array of masks.
+
+    Args:
+        grids(list): strings, each representing a sudoku grid
+
+    Returns:
+        An (N, 81) uint16 array, with every digit possible for empties.
+    """
+    chars = np.frombuffer(''.join(grids).encode('ascii'), dtype=np.uint8)
+    assert chars.size == 81 * len(grids), "Input grids must be strings of length 81 (9x9)"
+
+    return MASK_OF_CHAR[chars].reshape(len(grids), 81)
+
+def masks_to_grids(masks):
+    """
+    Convert an (N, 81) array of masks into grid strings, with '.' for any box
+    which isn't solved.
+    """
+    chars = CHAR_OF[masks].tobytes().decode('ascii')
+    return [chars[i:i + 81] for i in range(0, len(chars), 81)]
+
+
+# ==== STRATEGIES ======================================================================
+
+# Each strategy takes an (N, 81) array of masks and returns the new masks, along
+# with an (N,) boolean array of the puzzles it found to be inconsistent.
+
+def pad(masks):
+    """
+    Append a column of zeros to an (N, M) array, for the padding in the index arrays.
+    """
+    return np.concatenate([masks, np.zeros((len(masks), 1), dtype=masks.dtype)], axis=1)
+
+def scatter(unit_masks):
+    """
+    OR together, for every box, the masks found for it in each of its units.
+
+    Args:
+        unit_masks: An (N, 29, 9) array of masks, laid out like `UNITS`
+
+    Returns:
+        An (N, 81) array of masks.
+    """
+    flat = pad(unit_masks.reshape(len(unit_masks), -1))
+    return np.bitwise_or.reduce(flat[:, UNIT_POSITIONS], axis=2)
+
+def elimination(masks):
+    """
+    Eliminate values using the Elimination strategy, for every puzzle at once.
+    """
+    solved = pad(np.where(POPCOUNT[masks] == 1, masks, 0))
+    masks = masks & ~np.bitwise_or.reduce(solved[:, PEERS], axis=2)
+
+    return masks, (masks == 0).any(axis=1)
+
+def only_choice(masks):
+    """
+    Eliminate values using the Only Choice strategy, for every puzzle at once.
+    """
+    units = masks[:, UNITS]
+
+    # Digits seen in at least one box, and in at least two boxes of each unit
+    once = np.zeros(units.shape[:2], dtype=masks.dtype)
+    twice = np.zeros_like(once)
+    for position in range(units.shape[2]):
+        twice |= once & units[:, :, position]
+        once |= units[:, :, position]
+
+    only = scatter(units & (once & ~twice)[:, :, None])
+    masks = np.where(only != 0, masks & only, masks)
+
+    # A digit with no place in a unit, or two digits needing the same box
+    failed = (once != ALL_DIGITS).any(axis=1) | (POPCOUNT[only] > 1).any(axis=1)
+
+    return masks, failed
+
+def naked_twins(masks):
+    """
+    Eliminate values using the Naked Twins strategy, for every puzzle at once.
+    """
+    units = masks[:, UNITS]
+
+    # How many boxes of its unit have the same candidates as each box, itself included
+    repeats = (units[:, :, :, None] == units[:, :, None, :]).sum(axis=3)
+    bivalue = POPCOUNT[units] == 2
+    twins = bivalue & (repeats == 2)
+
+    # Remove the digits of every pair of twins from the other boxes of their unit
+    twin_digits = np.bitwise_or.reduce(np.where(twins, units, 0), axis=2)[:, :, None]
+    removed = np.where(twins, twin_digits & ~units, twin_digits)
+    masks = masks & ~scatter(removed)
+
+    # Three boxes sharing the same two candidates, or a box left with none
+    failed = (bivalue & (repeats > 2)).any(axis=(1, 2)) | (masks == 0).any(axis=1)
+
+    return masks, failed
+
+"""
+The constraint propagation strategies applied to a batch, in order.
+"""
+KNOWN_STRATEGIES = [
+    elimination,
+    only_choice,
+    naked_twins,
+]
+
+
+# ==== CORE PROGRAM ======================================================================
+
+def reduce_batch(masks):
+    """
+    Repeatedly apply every known strategy to every puzzle of the batch, until no
+    puzzle improves any further. Puzzles drop out of the batch as soon as they
+    stall or fail.
+
+    Args:
+        masks: An (N, 81) array of masks
+
+    Returns:
+        The reduced (N, 81) array of masks, and an (N,) boolean array of the
+        puzzles found to be inconsistent.
+    """
+    masks = masks.copy()
+    failed = np.zeros(len(masks), dtype=bool)
+    active = np.arange(len(masks))
+
+    while active.size:
+        before = masks[active]
+        after = before
+        inconsistent = np.zeros(active.size, dtype=bool)
+
+        for strategy in KNOWN_STRATEGIES:
+            after, strategy_failed = strategy(after)
+            inconsistent |= strategy_failed
+
+        masks[active] = after
+        failed[active] = inconsistent
+
+        # Carry on only with the puzzles which changed, and are still consistent
+        changed = (after != before).any(axis=1) & ~inconsistent
+        active = active[changed]
+
+    return masks, failed
+
+def solve_batch(grids):
+    """
+    Find the solutions to many Sudoku grids at once.
+
+    Args:
+        grids(list): strings, each representing a sudoku grid
+
+    Returns:
+        A list of the solved grids as 81-char strings, with False for grids with
+        no solution.
+    """
+    if not grids:
+        return []
+
+    masks, failed = reduce_batch(grids_to_masks(grids))
+    solved = (POPCOUNT[masks] == 1).all(axis=1)
+    grids = masks_to_grids(masks)
+
+    results = []
+    for i, grid in enumerate(grids):
+        if failed[i]:
+            results.append(False)
+        elif solved[i]:
+            results.append(grid)
+        else:
+            # Stalled, so branch with the scalar engine from here on
+            board = bitboard.reduce_puzzle(bitboard.Board(masks[i].tolist()))
+            if board and bitboard.search(board):
+                results.append(''.join(bitboard.DIGITS_OF[mask] for mask in board.cells))
+            else:
+                results.append(False)
+
+    return results
+
+def solve(grid):
+    """
+    Find the solution to a Sudoku grid.
+
+    Args:
+        grid(string): a string representing a sudoku grid.
+
+    Returns:
+        The dictionary representation of the final sudoku grid. False if no solution exists.
+    """
+    solved_grid = solve_batch([grid])[0]
+
+    if solved_grid:
+        return dict(zip(BOXES, solved_grid))
+    else:
+        return False
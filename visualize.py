@@ -1,17 +1,21 @@
 from PySudoku import play
 
-def visualize_assignments(assignments):
-    """ Visualizes the set of assignments created by the Sudoku AI"""
+def filter_assignments(assignments):
+    """
+    Lazily yields the assignments which solve at least one new box, so that a
+    history replayed on demand never needs to be held in memory at once.
+    """
     last_assignment = None
-    filtered_assignments = []
 
-    for i in range(len(assignments)):
+    for assignment in assignments:
         if last_assignment:
             last_assignment_items = [item for item in last_assignment.items() if len(item[1]) == 1]
-            current_assignment_items = [item for item in assignments[i].items() if len(item[1]) == 1]
+            current_assignment_items = [item for item in assignment.items() if len(item[1]) == 1]
             shared_items = set(last_assignment_items) & set(current_assignment_items)
             if len(shared_items) < len(current_assignment_items):
-                filtered_assignments.append(assignments[i])
-        last_assignment = assignments[i]
+                yield assignment
+        last_assignment = assignment
 
-    play(filtered_assignments)
+def visualize_assignments(assignments):
+    """ Visualizes the set of assignments created by the Sudoku AI"""
+    play(filter_assignments(assignments))
@@ -0,0 +1,602 @@
+"""
+A bitmask engine for Diagonal Sudoku boards of any size: 9x9, 16x16 or 25x25.
+
+It works like `bitboard.py`, but without its lookup tables. Those are indexed
+by mask, which is 2 ** 9 entries for 9x9 but would be 2 ** 25 for 25x25. Here
+a box's candidates are an N-bit Python int, and the counting is done with
+`int.bit_count` and bit tricks:
+
+    * `mask & (mask - 1)` is 0 exactly when a mask has at most one candidate
+    * `mask & -mask` is the lowest candidate of a mask
+
+The geometry comes from `board.get_geometry`, picked by the length of the grid,
+so the same code solves every size. Boards are solved in place, with a trail
+to undo guesses, by event-driven propagation of elimination, only choice and
+naked twins, and an explicit-stack search guessing the box with the fewest
+candidates.
+
+Example:
+    values = solve(grid)  # a grid string of 81, 256 or 625 chars
+"""
+import random
+
+from board import geometry_of
+
+
+# ==== BOARD ======================================================================
+
+class Board:
+    """
+    A board state, holding one candidate mask per box in `cells`, like
+    `bitboard.Board` but for any `Geometry`. Bit `d` of a mask stands for
+    `geometry.DIGITS[d]`.
+    """
+    __slots__ = ('geometry', 'intersections', 'all_digits', 'cells', 'trail', 'pending')
+
+    def __init__(self, geometry, cells):
+        self.geometry = geometry
+        self.intersections = get_intersections(geometry)
+        self.all_digits = (1 << geometry.SIZE) - 1
+        self.cells = cells
+        self.trail = []
+        self.pending = []
+
+    @classmethod
+    def from_grid(cls, grid, geometry=None):
+        """
+        Create a board from a grid string, with every digit possible for empties.
+
+        Args:
+            grid(string) - A grid in string form, with '.' for empties.
+            geometry(Geometry) - The geometry of the grid, by default found from its length
+        """
+        if geometry is None:
+            geometry = geometry_of(grid)
+
+        assert len(grid) == len(geometry.BOXES), \
+            "Input grid must be a string of length %d" % len(geometry.BOXES)
+
+        bit_of = dict((digit, 1 << d) for d, digit in enumerate(geometry.DIGITS))
+        bit_of['.'] = (1 << geometry.SIZE) - 1
+
+        return cls(geometry, [bit_of[x] for x in grid])
+
+    def to_values(self):
+        """
+        Convert the board back into dict-of-strings form.
+
+        Returns:
+            A dictionary of the form {'box_name': '123456789', ...}
+        """
+        digits = self.geometry.DIGITS
+        return dict(zip(self.geometry.BOXES, [
+            ''.join(digits[d] for d in range(len(digits)) if mask >> d & 1)
+            for mask in self.cells
+        ]))
+
+    def to_grid(self):
+        """
+        Returns:
+            The board as a grid string, with '.' for any box which isn't solved.
+        """
+        digits = self.geometry.DIGITS
+        return ''.join(
+            digits[mask.bit_length() - 1] if mask and not mask & (mask - 1) else '.'
+            for mask in self.cells
+        )
+
+    def set(self, i, mask):
+        """
+        Set the candidates of box `i`, recording the old ones on the trail and
+        queueing the box for propagation.
+        """
+        old = self.cells[i]
+        if old != mask:
+            self.cells[i] = mask
+            self.trail += (i, old)
+            self.pending.append(i)
+
+    def mark(self):
+        """
+        Returns:
+            A mark of the current trail position, to later `undo` back to.
+        """
+        return len(self.trail)
+
+    def undo(self, mark):
+        """
+        Restore every box changed since `mark` was taken.
+        """
+        cells = self.cells
+        trail = self.trail
+        del self.pending[:]
+        while len(trail) > mark:
+            old = trail.pop()
+            cells[trail.pop()] = old
+
+
+# ==== STRATEGIES ======================================================================
+
+# Propagators like those of `bitboard.py`, triggered by a change to a box or to a
+# unit, which return False as soon as they find the board inconsistent. Unit
+# strategies take the position of the unit in `geometry.UNIT_INDICES`, so their
+# tables can be indexed by it.
+
+def elimination(board, i, peers):
+    """
+    Eliminate values using the Elimination strategy, triggered by a change to box `i`.
+
+    Args:
+        board(Board): The game state
+        i(int): The index of the changed box
+        peers(tuple): The indices of the peers of box `i`
+
+    Returns:
+        False if removing the digit of a solved box empties a peer, True otherwise.
+    """
+    cells = board.cells
+    mask = cells[i]
+
+    if not mask & (mask - 1):
+        for peer in peers:
+            if cells[peer] & mask:
+                if cells[peer] == mask:
+                    return False
+                board.set(peer, cells[peer] & ~mask)
+
+    return True
+
+def only_choice(board, k):
+    """
+    Eliminate values using the Only Choice strategy, triggered by a change to unit `k`.
+
+    Returns:
+        False if a digit has no place left in the unit, or two digits need the
+        same box. True otherwise.
+    """
+    cells = board.cells
+    unit = board.geometry.UNIT_INDICES[k]
+
+    # Digits seen in at least one box, and in at least two boxes of the unit
+    once = twice = 0
+    for i in unit:
+        mask = cells[i]
+        twice |= once & mask
+        once |= mask
+
+    if once != board.all_digits:
+        return False
+
+    only = once & ~twice
+    if only:
+        for i in unit:
+            mask = cells[i] & only
+            if mask and mask != cells[i]:
+                if mask & (mask - 1):
+                    return False
+                board.set(i, mask)
+
+    return True
+
+def naked_twins(board, k):
+    """
+    Eliminate values using the Naked Twins strategy, triggered by a change to unit `k`.
+
+    Returns:
+        False if the twins leave a box empty, or three boxes share the same two
+        values. True otherwise.
+    """
+    cells = board.cells
+    unit = board.geometry.UNIT_INDICES[k]
+
+    seen = set()
+    twins = set()
+    for i in unit:
+        mask = cells[i]
+        if mask.bit_count() == 2:
+            if mask in twins:
+                return False
+            if mask in seen:
+                twins.add(mask)
+            seen.add(mask)
+
+    for twin in twins:
+        for i in unit:
+            mask = cells[i]
+            if mask != twin and mask & twin:
+                if not mask & ~twin:
+                    return False
+                board.set(i, mask & ~twin)
+
+    return True
+
+# The intersection tables built so far, by geometry
+INTERSECTIONS = {}
+
+def get_intersections(geometry):
+    """
+    Build the tables of `intersections` for a geometry.
+
+    A unit is split into segments by the units crossing it in more than one box,
+    e.g. a row by the squares, or a square by the rows. Crossing units of the same
+    kind which cover the unit between them make one partition of it, like the
+    squares of a row. Any other, like a diagonal through a square, makes a
+    partition of two: the boxes in the crossing unit, and the rest.
+
+    Returns:
+        For each unit, a tuple of partitions, each a tuple of (segment, rest of
+        the crossing unit) pairs of box index tuples. The rest is empty for a
+        segment with no crossing unit.
+    """
+    tables = INTERSECTIONS.get(geometry)
+    if tables is not None:
+        return tables
+
+    size = geometry.SIZE
+    units = [frozenset(unit) for unit in geometry.UNIT_INDICES]
+
+    # Units are rows, columns, squares then diagonals, `size` of each but the last
+    kinds = [range(0, size), range(size, 2 * size), range(2 * size, 3 * size), range(3 * size, len(units))]
+
+    tables = []
+    for k, unit in enumerate(geometry.UNIT_INDICES):
+        partitions = []
+
+        for kind in kinds:
+            crossings = [
+                (tuple(i for i in unit if i in units[j]), tuple(i for i in geometry.UNIT_INDICES[j] if i not in units[k]))
+                for j in kind
+                if j != k and len(units[k] & units[j]) > 1
+            ]
+
+            if sum(len(segment) for segment, rest in crossings) == len(unit):
+                partitions.append(tuple(crossings))
+            else:
+                for segment, rest in crossings:
+                    partitions.append(((segment, rest), (tuple(i for i in unit if i not in segment), ())))
+
+        tables.append(tuple(partitions))
+
+    tables = INTERSECTIONS[geometry] = tuple(tables)
+    return tables
+
+def intersections(board, k):
+    """
+    Eliminate values using pointing pairs and box/line reduction, for every
+    unit crossing unit `k`, triggered by a change to unit `k`.
+
+    A digit which can only go in one segment of a partition of the unit must
+    go in the crossing unit of that segment, so can be ruled out of the rest of
+    the crossing unit.
+
+    Returns:
+        False if a box is left empty, True otherwise.
+    """
+    cells = board.cells
+
+    for partition in board.intersections[k]:
+        # Digits seen in at least one segment, and in at least two
+        once = twice = 0
+        masks = []
+        for segment, rest in partition:
+            mask = 0
+            for i in segment:
+                mask |= cells[i]
+            masks.append(mask)
+            twice |= once & mask
+            once |= mask
+
+        only = once & ~twice
+        if not only:
+            continue
+
+        for mask, (segment, rest) in zip(masks, partition):
+            confined = mask & only
+            if confined:
+                for i in rest:
+                    mask = cells[i]
+                    if mask & confined:
+                        if not mask & ~confined:
+                            return False
+                        board.set(i, mask & ~confined)
+
+    return True
+
+"""
+The unit strategies, in two tiers. The cheap ones run on a changed unit straight
+away, and `intersections`, which looks at every unit crossing it, only once they
+have all stalled, so a unit which changes many times over gets one pass.
+"""
+UNIT_STRATEGIES = [
+    only_choice,
+    naked_twins,
+]
+
+STALLED_UNIT_STRATEGIES = [
+    intersections,
+]
+
+
+# ==== CORE PROGRAM ======================================================================
+
+def propagate(board):
+    """
+    Run elimination on every box queued on `board.pending`, and the unit
+    strategies on their units, until nothing is left to do. Like
+    `bitboard.propagate`, the box strategy runs to a fixpoint before any unit
+    strategy, and the `UNIT_STRATEGIES` before any `STALLED_UNIT_STRATEGIES`.
+
+    Returns:
+        True once the queue is empty, or False as soon as the board is found to
+        be inconsistent.
+    """
+    geometry = board.geometry
+    peer_indices = geometry.PEER_INDICES
+    unit_ids_of = geometry.UNIT_IDS_OF
+    pending = board.pending
+
+    # Units waiting for each tier of strategies, and whether each one is queued
+    units = []
+    queued = [False] * len(geometry.UNIT_INDICES)
+    stalled_units = []
+    stalled_queued = queued[:]
+
+    while True:
+        while pending:
+            i = pending.pop()
+
+            if not elimination(board, i, peer_indices[i]):
+                del pending[:]
+                return False
+
+            for k in unit_ids_of[i]:
+                if not queued[k]:
+                    queued[k] = True
+                    units.append(k)
+                if not stalled_queued[k]:
+                    stalled_queued[k] = True
+                    stalled_units.append(k)
+
+        if units:
+            k = units.pop()
+            queued[k] = False
+            strategies = UNIT_STRATEGIES
+        elif stalled_units:
+            k = stalled_units.pop()
+            stalled_queued[k] = False
+            strategies = STALLED_UNIT_STRATEGIES
+        else:
+            return True
+
+        for strategy in strategies:
+            if not strategy(board, k):
+                del pending[:]
+                return False
+
+            # Get back to elimination as soon as anything changed. Any change
+            # queues the units of the changed box, this one included.
+            if pending:
+                break
+
+def reduce_puzzle(board):
+    """
+    Propagate every constraint on the board until there is no improvement of
+    the board state.
+
+    Returns:
+        The new game state, or False if a box has no possible values left.
+    """
+    board.pending[:] = range(len(board.cells))
+
+    if not propagate(board):
+        return False
+
+    return board
+
+def bits_of(mask):
+    """
+    Returns:
+        The single-bit masks making up a mask, in ascending digit order.
+    """
+    bits = []
+    while mask:
+        bit = mask & -mask
+        bits.append(bit)
+        mask ^= bit
+    return bits
+
+class Solver:
+    """
+    A depth-first search over a board, driven by an explicit stack of choice
+    points, like `bitboard.Solver`.
+
+    The box to guess is chosen by dom/wdeg, as in `heuristics.DomWdeg`: the
+    fewest candidates per weight of the box's units, where a unit's weight
+    counts the failed guesses within it. On large boards it takes far fewer
+    nodes than the fewest candidates alone.
+
+    Example:
+        solver = Solver(reduce_puzzle(Board.from_grid(grid)))
+        solver.run()
+    """
+    __slots__ = ('board', 'stack', 'nodes', 'backtracks', 'solved', 'random', 'weights')
+
+    def __init__(self, board, seed=None):
+        """
+        Args:
+            board(Board): The game state, already reduced. It is solved in place.
+            seed: Optional, tries the candidates of a box in a random order
+                from this seed, rather than in digit order
+        """
+        self.board = board
+        self.random = None if seed is None else random.Random(seed)
+
+        # The choice points, each a [box index, untried candidate bits, mark]
+        # list, with the next bit to try last
+        self.stack = []
+
+        self.nodes = 0
+        self.backtracks = 0
+
+        # None while the search is unfinished, then True or False
+        self.solved = None
+
+        # The weight of each box: the sum of the weights of its units, which
+        # start at 1
+        self.weights = [len(ids) for ids in board.geometry.UNIT_IDS_OF]
+
+    def choose(self):
+        """
+        Returns:
+            The index of the unfilled box with the fewest candidates per weight,
+            ties going to the first box, or None if the board is solved.
+        """
+        weights = self.weights
+        best = None
+        best_count = 1
+        best_weight = 0
+
+        for i, mask in enumerate(self.board.cells):
+            if mask & (mask - 1):
+                # count / weight < best_count / best_weight, without dividing
+                count = mask.bit_count()
+                if count * best_weight < best_count * weights[i]:
+                    best, best_count, best_weight = i, count, weights[i]
+
+        return best
+
+    def failed(self, i):
+        """
+        Called when a guess on box `i` fails to propagate, to weigh its units.
+        """
+        geometry = self.board.geometry
+        weights = self.weights
+
+        for k in geometry.UNIT_IDS_OF[i]:
+            for j in geometry.UNIT_INDICES[k]:
+                weights[j] += 1
+
+    def advance(self):
+        """
+        Move on to the next consistent guess, backtracking as far as needed.
+
+        Returns:
+            True once a guess propagates cleanly, or False if every choice point
+            is exhausted.
+        """
+        board = self.board
+        stack = self.stack
+
+        while stack:
+            s, untried, mark = stack[-1]
+            board.undo(mark)
+
+            if not untried:
+                stack.pop()
+                continue
+
+            board.set(s, untried.pop())
+            if propagate(board):
+                return True
+
+            self.backtracks += 1
+            self.failed(s)
+
+        return False
+
+    def run(self, max_nodes=None):
+        """
+        Search until the board is solved, there is no solution, or `max_nodes`
+        more nodes have been expanded. A suspended search resumes where it left
+        off on the next call.
+
+        Args:
+            max_nodes(int): The most nodes to expand in this call, or None for no limit
+
+        Returns:
+            True if the board is solved, False if there is no solution, or None
+            if the search was suspended.
+        """
+        board = self.board
+        limit = None if max_nodes is None else self.nodes + max_nodes
+
+        while self.solved is None:
+            if self.nodes == limit:
+                return None
+            self.nodes += 1
+
+            s = self.choose()
+            if s is None:
+                self.solved = True
+            else:
+                untried = bits_of(board.cells[s])
+                if self.random is None:
+                    untried.reverse()
+                else:
+                    self.random.shuffle(untried)
+                self.stack.append([s, untried, board.mark()])
+                if not self.advance():
+                    self.solved = False
+
+        return self.solved
+
+    def skip(self):
+        """
+        Move on from a solution to the next guess, so that the next `run` looks
+        for another solution.
+        """
+        self.solved = None if self.advance() else False
+
+def make_solver(grid, seed=None):
+    """
+    Reduce a grid and set up a `Solver` for it.
+
+    Args:
+        grid(string): a string representing a sudoku grid of any size
+        seed: Optional, seed for a random order of candidates
+
+    Returns:
+        The solver, or None if the grid reduces to a failed board.
+    """
+    board = reduce_puzzle(Board.from_grid(grid))
+    if not board:
+        return None
+
+    return Solver(board, seed)
+
+def solve(grid, seed=None):
+    """
+    Find the solution to a Sudoku grid of any size.
+
+    Args:
+        grid(string): a string representing a sudoku grid, with '.' for empties.
+            Its length picks the board: 81 for 9x9, 256 for 16x16, 625 for 25x25.
+        seed: Optional, seed for a random order of candidates
+
+    Returns:
+        The dictionary representation of the final sudoku grid. False if no solution exists.
+    """
+    solver = make_solver(grid, seed)
+
+    if solver is not None and solver.run():
+        return solver.board.to_values()
+    else:
+        return False
+
+def count_solutions(grid, limit=2):
+    """
+    Count the solutions of a Sudoku grid of any size, up to `limit`.
+
+    Returns:
+        The number of solutions found, at most `limit`.
+    """
+    solver = make_solver(grid)
+    if solver is None:
+        return 0
+
+    count = 0
+    while count < limit and solver.run():
+        count += 1
+        solver.skip()
+
+    return count
@@ -0,0 +1,115 @@
+import benchmark
+import bitboard
+import board
+import cli
+import io
+import solution
+import unittest
+import utils
+import wideboard
+from contextlib import redirect_stdout
+
+
+def is_solution(values, geometry, grid=''):
+    """
+    Whether every unit holds every digit once, and the clues of `grid` are kept.
+    """
+    return (
+        all(sorted(values[box] for box in unit) == sorted(geometry.DIGITS) for unit in geometry.ALL_UNITS)
+        and all(values[box] == x for box, x in zip(geometry.BOXES, grid) if x != '.')
+    )
+
+
+class TestGeometry(unittest.TestCase):
+    def test_9x9(self):
+        geometry = board.get_geometry(3)
+        self.assertIs(geometry, board.GEOMETRY)
+        self.assertEqual(geometry.DIGITS, '123456789')
+        self.assertEqual(board.SQUARE_UNITS[4], ['D4', 'D5', 'D6', 'E4', 'E5', 'E6', 'F4', 'F5', 'F6'])
+        self.assertEqual(board.DIAGONAL_UNITS[1][0], 'I1')
+        self.assertEqual(len(board.PEERS_OF['A1']), 26)
+        self.assertEqual(len(board.PEERS_OF['A2']), 20)
+
+    def test_larger(self):
+        for box_size, digits in ((4, '123456789ABCDEFG'), (5, '123456789ABCDEFGHIJKLMNOP')):
+            geometry = board.get_geometry(box_size)
+            size = box_size ** 2
+
+            self.assertEqual(geometry.DIGITS, digits)
+            self.assertEqual(len(geometry.BOXES), size * size)
+            self.assertEqual(len(geometry.ALL_UNITS), 3 * size + 2)
+            self.assertEqual(geometry.BOXES[size], 'B1')
+            self.assertEqual(geometry.BOXES[-1], geometry.ROWS[-1] + str(size))
+            for unit in geometry.ALL_UNITS:
+                self.assertEqual(len(set(unit)), size)
+            for box in geometry.BOXES:
+                for peer in geometry.PEERS_OF[box]:
+                    self.assertIn(box, geometry.PEERS_OF[peer])
+
+    def test_geometry_of(self):
+        self.assertIs(board.geometry_of('.' * 256), board.get_geometry(4))
+        with self.assertRaises(ValueError):
+            board.geometry_of('.' * 100)
+
+    def test_values(self):
+        geometry = board.get_geometry(4)
+        grid = 'G' + '.' * 254 + 'A'
+        values = utils.convert_grid_string_to_dict(grid)
+        self.assertEqual(values['A1'], 'G')
+        self.assertEqual(values['P16'], 'A')
+        self.assertEqual(values['A2'], geometry.DIGITS)
+        self.assertEqual(utils.convert_dict_to_grid_string(values), grid)
+
+    def test_display(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            utils.display(utils.convert_grid_string_to_dict('.' * 256))
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 2 + 16 + 3)
+        self.assertIn('16', lines[0])
+
+
+class TestWideboard(unittest.TestCase):
+    # One of the quicker puzzles of the corpus
+    grid_16x16 = benchmark.load_corpus('16x16')[4]
+
+    def test_9x9_like_bitboard(self):
+        for grid in benchmark.load_corpus('hard')[:5]:
+            self.assertEqual(wideboard.solve(grid), bitboard.solve(grid))
+            self.assertEqual(wideboard.count_solutions(grid), 1)
+
+    def test_16x16(self):
+        grid = self.grid_16x16
+        values = wideboard.solve(grid)
+        self.assertTrue(is_solution(values, board.get_geometry(4), grid))
+
+    def test_empty_25x25(self):
+        values = wideboard.solve('.' * 625)
+        self.assertTrue(is_solution(values, board.get_geometry(5)))
+
+    def test_no_solution(self):
+        # Two 1s in the first row
+        self.assertIs(wideboard.solve('11' + '.' * 254), False)
+
+    def test_intersections(self):
+        # 1 can only go in A1 or A2 of the first square, so not in the rest of row A
+        geometry = board.get_geometry(4)
+        state = wideboard.Board(geometry, [(1 << 16) - 1] * 256)
+        for box in ('B1', 'B2', 'B3', 'B4', 'C1', 'C2', 'C3', 'C4', 'D1', 'D2', 'D3', 'D4', 'A3', 'A4'):
+            state.cells[geometry.INDEX_OF[box]] &= ~1
+
+        self.assertTrue(wideboard.intersections(state, geometry.ALL_UNITS.index(geometry.SQUARE_UNITS[0])))
+        self.assertFalse(state.cells[geometry.INDEX_OF['A5']] & 1)
+        self.assertTrue(state.cells[geometry.INDEX_OF['E1']] & 1)
+
+    def test_solution_engines(self):
+        grid = self.grid_16x16
+        self.assertEqual(solution.solve(grid, engine='auto'), wideboard.solve(grid))
+        self.assertEqual(solution.solve(grid, engine='wide'), wideboard.solve(grid))
+        for engine in (None, 'bitmask', 'numpy'):
+            with self.assertRaises(ValueError):
+                solution.solve(grid, engine=engine)
+        self.assertEqual(cli.parse_grid(grid.replace('.', '0')), grid)
+
+if __name__ == '__main__':
+    unittest.main()